@@ -7,6 +7,8 @@ from mmaze.generator.base import BaseMazeGenerator
 from mmaze.maze import Maze
 from mmaze.solver.base import BaseSolver
 from mmaze.cell import CellType
+from mmaze.batch import generate_many, solve_many
+from mmaze.chunked import ChunkedMaze
 
 __GENERATOR_MAP: tp.Dict[str, tp.Type[BaseMazeGenerator]] = {}
 __BASE_GENERATOR_MODULE = BaseMazeGenerator.__module__
@@ -32,27 +34,39 @@ def _set_solver_map(cls, m: dict):
         _set_solver_map(subclass, m)
 
 
+def _generator_map() -> tp.Dict[str, tp.Type[BaseMazeGenerator]]:
+    if len(__GENERATOR_MAP) == 0:
+        _set_generator_map(BaseMazeGenerator, __GENERATOR_MAP)
+    return __GENERATOR_MAP
+
+
+def _solver_map() -> tp.Dict[str, tp.Type[BaseSolver]]:
+    if len(__SOLVER_MAP) == 0:
+        _set_solver_map(BaseSolver, __SOLVER_MAP)
+    return __SOLVER_MAP
+
+
 def generate(
         width: int,
         height: int,
         symmetry: str = "none",
         method: str = "backtracking",
-        seed: tp.Optional[int] = None
+        seed: tp.Optional[int] = None,
+        storage: str = "bytearray",
+        path: tp.Optional[str] = None,
 ) -> Maze:
-    if len(__GENERATOR_MAP) == 0:
-        _set_generator_map(BaseMazeGenerator, __GENERATOR_MAP)
+    generator_map = _generator_map()
     try:
-        g = __GENERATOR_MAP[method.lower()]()
+        g = generator_map[method.lower()]()
     except KeyError as e:
-        raise ValueError(f"method of '{method}' is not found, try one of {list(__GENERATOR_MAP.keys())}: {e}")
-    return g.generate(width=width, height=height, symmetry=symmetry, seed=seed)
+        raise ValueError(f"method of '{method}' is not found, try one of {list(generator_map.keys())}: {e}")
+    return g.generate(width=width, height=height, symmetry=symmetry, seed=seed, storage=storage, path=path)
 
 
 def solve(m: "Maze", start: tp.Sequence[int], end: tp.Sequence[int], method: str = "backtracking") -> tp.List:
-    if len(__SOLVER_MAP) == 0:
-        _set_solver_map(BaseSolver, __SOLVER_MAP)
+    solver_map = _solver_map()
     try:
-        s = __SOLVER_MAP[method.lower()]()
+        s = solver_map[method.lower()]()
     except KeyError as e:
-        raise ValueError(f"method of '{method}' is not found, try one of {list(__SOLVER_MAP.keys())}: {e}")
+        raise ValueError(f"method of '{method}' is not found, try one of {list(solver_map.keys())}: {e}")
     return s.solve(maze=m, start=start, end=end)
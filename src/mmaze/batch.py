@@ -0,0 +1,221 @@
+import os
+import random
+import typing as tp
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import mmaze
+from mmaze.distance import DistanceField
+from mmaze.maze import Maze
+
+
+def _build_configs(
+        configs: tp.Union[int, tp.Iterable[dict]],
+        width: tp.Optional[int],
+        height: tp.Optional[int],
+        method: str,
+        symmetry: str,
+        seeds: tp.Optional[tp.Sequence[int]],
+) -> tp.List[dict]:
+    """Expand the arguments of ``generate_many`` into one ``mmaze.generate`` config per maze."""
+    default = {"width": width, "height": height, "method": method, "symmetry": symmetry}
+    if isinstance(configs, int):
+        configs = [dict(default) for _ in range(configs)]
+    else:
+        configs = [dict(default, **c) for c in configs]
+    if seeds is not None:
+        seeds = list(seeds)
+        if len(seeds) != len(configs):
+            raise ValueError(f"got {len(seeds)} seeds for {len(configs)} mazes")
+        for c, seed in zip(configs, seeds):
+            c["seed"] = seed
+    for c in configs:
+        if c["width"] is None or c["height"] is None:
+            raise ValueError("width and height must be given, in the arguments or in every config")
+        if c.get("seed") is None:
+            # draw seeds here, forked workers would otherwise share one random state
+            c["seed"] = random.getrandbits(32)
+    return configs
+
+
+def _run_chunk(
+        jobs: tp.List[tp.Tuple[int, dict]],
+        solve: tp.Optional[tp.Tuple[tp.Sequence[int], tp.Sequence[int]]],
+        solve_method: str,
+        serializer: tp.Optional[tp.Callable[[Maze], tp.Any]],
+) -> tp.List[tp.Tuple[int, tp.Any]]:
+    """Generate, optionally solve, and serialize a chunk of mazes inside a worker.
+
+    Returns:
+        list: (job index, result) pairs, the result being the serializer output, or the
+            maze bytes together with its solutions when no serializer is given
+    """
+    results = []
+    for i, config in jobs:
+        m = mmaze.generate(**config)
+        if solve is not None:
+            m.solve(solve[0], solve[1], method=solve_method)
+        if serializer is None:
+            results.append((i, (m.tobytes(), m.solutions)))
+        else:
+            results.append((i, serializer(m)))
+    return results
+
+
+def _to_result(res, serializer):
+    if serializer is not None:
+        return res
+    data, solutions = res
+    m = Maze.frombytes(data)
+    m.solutions = solutions
+    return m
+
+
+def _iter_completed(executor, futures, serializer):
+    try:
+        for future in as_completed(futures):
+            for _, res in future.result():
+                yield _to_result(res, serializer)
+    finally:
+        # also reached when the iterator is closed before it is drained: drop the chunks not started yet
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=True)
+
+
+def generate_many(
+        configs: tp.Union[int, tp.Iterable[dict]],
+        width: tp.Optional[int] = None,
+        height: tp.Optional[int] = None,
+        method: str = "backtracking",
+        seeds: tp.Optional[tp.Sequence[int]] = None,
+        symmetry: str = "none",
+        solve: tp.Optional[tp.Tuple[tp.Sequence[int], tp.Sequence[int]]] = None,
+        solve_method: str = "shortestpath",
+        serializer: tp.Optional[tp.Callable[[Maze], tp.Any]] = None,
+        workers: tp.Optional[int] = None,
+        chunksize: int = 1,
+        ordered: bool = True,
+) -> tp.Union[tp.List, tp.Iterator]:
+    """Generate many mazes, fanned out over a pool of worker processes.
+
+    Args:
+        configs (int or list): number of mazes, or one dict of ``mmaze.generate`` arguments per maze;
+            keys missing from a dict fall back to the arguments below
+        width (int): maze width in cells
+        height (int): maze height in cells
+        method (str): generator name
+        seeds (list): one seed per maze, random seeds are drawn when not given
+        symmetry (str): symmetry way
+        solve (tuple): (start, end) to solve every maze for, inside the worker
+        solve_method (str): solver name
+        serializer (callable): picklable function turning a maze into the result, run inside the worker.
+            When not given, mazes cross the process boundary as ``Maze.tobytes`` and are rebuilt,
+            with their solutions, in this process
+        workers (int): number of worker processes, default to the number of CPUs; 0 or 1 runs in this process
+        chunksize (int): number of mazes handed to a worker at a time
+        ordered (bool): return a list in config order, otherwise an iterator in completion order,
+            which shuts the pool down once drained or closed; use ``contextlib.closing`` to stop early
+    Returns:
+        list or iterator: one result per maze
+    """
+    if chunksize < 1:
+        raise ValueError(f"chunksize must be at least 1, but got {chunksize}")
+    configs = _build_configs(configs, width, height, method, symmetry, seeds)
+    jobs = list(enumerate(configs))
+    chunks = [jobs[i:i + chunksize] for i in range(0, len(jobs), chunksize)]
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if workers <= 1:
+        results = (
+            _to_result(res, serializer)
+            for chunk in chunks for _, res in _run_chunk(chunk, solve, solve_method, serializer)
+        )
+        return list(results) if ordered else results
+
+    executor = ProcessPoolExecutor(max_workers=workers)
+    futures = [executor.submit(_run_chunk, chunk, solve, solve_method, serializer) for chunk in chunks]
+    if not ordered:
+        return _iter_completed(executor, futures, serializer)
+
+    results = [None] * len(jobs)
+    with executor:
+        for future in futures:
+            for i, res in future.result():
+                results[i] = _to_result(res, serializer)
+    return results
+
+
+def _length(solutions: list, start: tp.Sequence[int], end: tp.Sequence[int]) -> int:
+    """number of cells walked by the solution of a pair, -1 without a solution"""
+    if not solutions:
+        return -1
+    if tuple(start) == tuple(end):
+        return 0
+    # the solution holds the midpoints and cells between start and end
+    return (len(solutions[0]) + 1) // 2
+
+
+def solve_many(
+        maze: Maze,
+        pairs: tp.Iterable[tp.Tuple[tp.Sequence[int], tp.Sequence[int]]],
+        method: str = "auto",
+        lengths: bool = False,
+) -> tp.List:
+    """Solve many (start, end) pairs on one maze, sharing the search work between them.
+
+    With "auto", a perfect maze answers every pair from one ``Maze.tree_index``. Otherwise, and with
+    "shortestpath", pairs are grouped by end, or by start when there are fewer distinct starts, and every group
+    of several pairs is answered from one ``DistanceField``, dropped once its group is answered rather than cached
+    on the maze. Other solver names solve the pairs one by one.
+
+    Args:
+        maze (Maze): maze to solve
+        pairs (list): (start, end) pairs, in cell coordinates
+        method (str): "auto", or a solver name
+        lengths (bool): return the number of cells walked from start to end, -1 when end is not reachable,
+            instead of the solutions
+    Returns:
+        list: one result per pair, the solutions in the format of ``mmaze.solve``, or a length
+    """
+    pairs = [((s[0], s[1]), (e[0], e[1])) for s, e in pairs]
+    method = method.lower()
+    if method not in ("auto", "shortestpath"):
+        results = [mmaze.solve(maze, s, e, method=method) for s, e in pairs]
+        return [_length(r, s, e) for r, (s, e) in zip(results, pairs)] if lengths else results
+
+    starts = {s for s, _ in pairs}
+    ends = {e for _, e in pairs}
+    if method == "auto" and min(len(starts), len(ends)) > 1:
+        try:
+            index = maze.tree_index()
+        except ValueError:
+            pass
+        else:
+            if lengths:
+                return [index.distance(s, e) for s, e in pairs]
+            return [index.solutions(s, e) for s, e in pairs]
+
+    # one flood per distinct end, or per distinct start with the paths reversed
+    by_end = len(ends) <= len(starts)
+    groups = {}
+    for i, (s, e) in enumerate(pairs):
+        groups.setdefault(e if by_end else s, []).append(i)
+    results = [None] * len(pairs)
+    for target, indices in groups.items():
+        if len(indices) == 1:
+            # a lone pair gains nothing from a full flood, the solver stops as soon as it reaches the end
+            s, e = pairs[indices[0]]
+            solutions = mmaze.solve(maze, s, e, method="shortestpath")
+            results[indices[0]] = _length(solutions, s, e) if lengths else solutions
+            continue
+        field = DistanceField(maze, target)
+        for i in indices:
+            source = pairs[i][0] if by_end else pairs[i][1]
+            if lengths:
+                results[i] = field.get_distance(source)
+            elif by_end:
+                results[i] = field.solutions(source)
+            else:
+                results[i] = [p[::-1] for p in field.solutions(source)]
+    return results
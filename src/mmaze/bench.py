@@ -0,0 +1,184 @@
+"""Benchmark every generator and solver over a ladder of maze sizes.
+
+Usage: python -m mmaze.bench [--sizes 100,10000] [--repeat 5] [-o result.json]
+"""
+import argparse
+import json
+import math
+import platform
+import random
+import sys
+import time
+import tracemalloc
+import typing as tp
+
+import mmaze
+
+DEFAULT_SIZES = (10 ** 2, 10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6)
+# generator whose mazes the solvers are timed on
+SOLVER_MAZE_METHOD = "kruskal"
+
+
+def _percentile(values: tp.Sequence[float], q: float) -> float:
+    """nearest-rank percentile"""
+    values = sorted(values)
+    return values[max(0, math.ceil(q / 100 * len(values)) - 1)]
+
+
+def _side(cells: int) -> int:
+    return max(1, round(math.sqrt(cells)))
+
+
+def _measure(fn: tp.Callable[[int], tp.Any], repeat: int) -> tp.Dict[str, tp.Any]:
+    """Time ``fn(seed)`` for seeds ``0..repeat-1``, then run it once more under tracemalloc for the peak memory.
+
+    Returns:
+        dict: median and p95 wall time in seconds, peak traced memory in bytes, or the error raised
+    """
+    times = []
+    try:
+        for seed in range(repeat):
+            t0 = time.perf_counter()
+            fn(seed)
+            times.append(time.perf_counter() - t0)
+        tracemalloc.start()
+        try:
+            fn(0)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    except Exception as e:  # pylint: disable=broad-except
+        return {"median_s": None, "p95_s": None, "peak_bytes": None, "error": f"{type(e).__name__}: {e}"}
+    return {
+        "median_s": _percentile(times, 50),
+        "p95_s": _percentile(times, 95),
+        "peak_bytes": peak,
+        "error": None,
+    }
+
+
+def bench_generator(method: str, width: int, height: int, repeat: int = 3) -> tp.Dict[str, tp.Any]:
+    """Benchmark one generator on one maze size, with seeds ``0..repeat-1``."""
+    res = _measure(lambda seed: mmaze.generate(width, height, method=method, seed=seed), repeat)
+    return _record("generator", method, width, height, res)
+
+
+def bench_solver(method: str, maze: mmaze.Maze, repeat: int = 3) -> tp.Dict[str, tp.Any]:
+    """Benchmark one solver on one maze, from its top left to its bottom right cell, with seeds ``0..repeat-1``."""
+    end = (maze.base_height - 1, maze.base_width - 1)
+    solver_map = mmaze._solver_map()  # pylint: disable=protected-access
+    try:
+        solver = solver_map[method.lower()]
+    except KeyError as e:
+        raise ValueError(f"method of '{method}' is not found, try one of {list(solver_map.keys())}: {e}")
+    res = _measure(lambda seed: solver(rng=random.Random(seed)).solve(maze, (0, 0), end), repeat)
+    return _record("solver", method, maze.base_width, maze.base_height, res)
+
+
+def _record(kind: str, method: str, width: int, height: int, res: dict) -> tp.Dict[str, tp.Any]:
+    cells = width * height
+    median = res["median_s"]
+    return dict(
+        kind=kind, method=method, width=width, height=height, cells=cells,
+        cells_per_s=cells / median if median else None,
+        **res,
+    )
+
+
+def run(
+        sizes: tp.Sequence[int] = DEFAULT_SIZES,
+        generators: tp.Optional[tp.Sequence[str]] = None,
+        solvers: tp.Optional[tp.Sequence[str]] = None,
+        repeat: int = 3,
+        budget: float = 10.0,
+        log: tp.Optional[tp.TextIO] = None,
+) -> tp.Dict[str, tp.Any]:
+    """Benchmark generators and solvers over a ladder of sizes.
+
+    Args:
+        sizes (list): approximate number of cells of each maze, mazes are square
+        generators (list): generator names, default to all of them
+        solvers (list): solver names, default to all of them
+        repeat (int): timed runs per method and size
+        budget (float): once a method's median exceeds this many seconds, or it fails, larger sizes are skipped
+        log (file): stream to print progress lines to
+    Returns:
+        dict: environment description and one record per method and size
+    """
+    if generators is None:
+        generators = list(mmaze._generator_map().keys())  # pylint: disable=protected-access
+    if solvers is None:
+        solvers = list(mmaze._solver_map().keys())  # pylint: disable=protected-access
+    results = []
+    skip = set()
+    for cells in sorted(sizes):
+        side = _side(cells)
+        size_results = []
+        for method in generators:
+            if ("generator", method) not in skip:
+                size_results.append(bench_generator(method, side, side, repeat))
+        pending = [method for method in solvers if ("solver", method) not in skip]
+        if pending:
+            maze = mmaze.generate(side, side, method=SOLVER_MAZE_METHOD, seed=0)
+            for method in pending:
+                size_results.append(bench_solver(method, maze, repeat))
+
+        for r in size_results:
+            if r["error"] is not None or r["median_s"] > budget:
+                skip.add((r["kind"], r["method"]))
+            if log is not None:
+                print(_format(r), file=log)
+        results.extend(size_results)
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def _format(r: dict) -> str:
+    if r["error"] is not None:
+        return f"{r['kind']:9} {r['method']:13} {r['cells']:>9} cells  {r['error']}"
+    return (
+        f"{r['kind']:9} {r['method']:13} {r['cells']:>9} cells  "
+        f"median {r['median_s'] * 1e3:10.2f} ms  p95 {r['p95_s'] * 1e3:10.2f} ms  "
+        f"{r['cells_per_s']:12.0f} cells/s  peak {r['peak_bytes'] / 2 ** 20:8.2f} MiB"
+    )
+
+
+def main(argv: tp.Optional[tp.Sequence[str]] = None):
+    parser = argparse.ArgumentParser(prog="python -m mmaze.bench", description="benchmark generators and solvers")
+    parser.add_argument(
+        "--sizes", default=",".join(str(s) for s in DEFAULT_SIZES),
+        help="comma separated number of cells of the benchmarked mazes")
+    parser.add_argument("--generators", default=None, help="comma separated generator names, default to all")
+    parser.add_argument("--solvers", default=None, help="comma separated solver names, default to all")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per method and size")
+    parser.add_argument(
+        "--budget", type=float, default=10.0,
+        help="skip larger sizes of a method once its median time exceeds this many seconds")
+    parser.add_argument("-o", "--output", default=None, help="write the JSON result to this path instead of stdout")
+    args = parser.parse_args(argv)
+
+    def names(arg):
+        return None if arg is None else [n for n in arg.split(",") if n]
+
+    result = run(
+        sizes=[int(s) for s in args.sizes.split(",")],
+        generators=names(args.generators),
+        solvers=names(args.solvers),
+        repeat=args.repeat,
+        budget=args.budget,
+        log=sys.stderr,
+    )
+    if args.output is None:
+        json.dump(result, sys.stdout, indent=2)
+        print()
+    else:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,3 +7,14 @@ class CellType(Enum):
     START = 2
     END = 3
     SOLUTION = 4
+
+
+# integer codes stored in the maze grid, one byte per cell
+ROAD = CellType.ROAD.value
+WALL = CellType.WALL.value
+START = CellType.START.value
+END = CellType.END.value
+SOLUTION = CellType.SOLUTION.value
+
+# lookup table from integer code to cell type
+CELL_TYPES = tuple(CellType)
@@ -0,0 +1,132 @@
+import hashlib
+import typing as tp
+from collections import OrderedDict
+
+import mmaze
+from mmaze.maze import Maze
+from mmaze.cell import CellType, CELL_TYPES, ROAD
+
+# directions of the edge from a chunk to its parent chunk, toward the origin chunk
+_NORTH = 0
+_SOUTH = 1
+_WEST = 2
+_EAST = 3
+
+
+def _hash(*key) -> int:
+    """64 bits hash of the key, stable across processes and python versions"""
+    return int.from_bytes(hashlib.blake2b(repr(key).encode(), digest_size=8).digest(), "little")
+
+
+class ChunkedMaze:
+    """An endless perfect maze, generated lazily in fixed-size chunks.
+
+    Chunk ``(cx, cy)`` holds the cells ``cy * chunk_height <= row < (cy + 1) * chunk_height`` and
+    ``cx * chunk_width <= col < (cx + 1) * chunk_width``, and is a maze of its own generated from a seed derived
+    from ``(world_seed, cx, cy)``. Every chunk but the origin one opens a single door to a neighbor chunk closer to
+    the origin, which ties the chunks into a spanning tree, so the whole world is one perfect maze.
+
+    The world uses grid coordinates like ``Maze``: cell ``(row, col)`` is at ``(2 * row + 1, 2 * col + 1)``, and
+    coordinates may be negative. A chunk owns the walls on its north and west border.
+
+    Args:
+        world_seed (int): seed of the world
+        chunk_width (int): chunk width in cells
+        chunk_height (int): chunk height in cells
+        method (str): generator name of the chunks, it must generate perfect mazes
+        cache_size (int): number of chunks kept in memory, the least recently used ones are dropped
+    """
+
+    def __init__(
+            self,
+            world_seed: int,
+            chunk_width: int = 32,
+            chunk_height: int = 32,
+            method: str = "backtracking",
+            cache_size: int = 64,
+    ):
+        generator_map = mmaze._generator_map()  # pylint: disable=protected-access
+        try:
+            self._generator = generator_map[method.lower()]()
+        except KeyError as e:
+            raise ValueError(f"method of '{method}' is not found, try one of {list(generator_map.keys())}: {e}")
+        if cache_size < 1:
+            raise ValueError(f"cache_size must be positive, but got {cache_size}")
+        self.world_seed = world_seed
+        self.chunk_width = chunk_width
+        self.chunk_height = chunk_height
+        self.cache_size = cache_size
+        self._chunks: tp.OrderedDict[tp.Tuple[int, int], Maze] = OrderedDict()
+
+    def _parent(self, cx: int, cy: int) -> int:
+        """Direction of the edge from a chunk to its parent, -1 for the origin chunk."""
+        if cx == 0 and cy == 0:
+            return -1
+        if cx == 0 or (cy != 0 and _hash(self.world_seed, "parent", cx, cy) & 1):
+            return _NORTH if cy > 0 else _SOUTH
+        return _WEST if cx > 0 else _EAST
+
+    def _door(self, cx: int, cy: int, border: int) -> int:
+        """Cell offset of the door in the north or west border of a chunk."""
+        length = self.chunk_width if border == _NORTH else self.chunk_height
+        return _hash(self.world_seed, "door", cx, cy, border) % length
+
+    def chunk(self, cx: int, cy: int) -> Maze:
+        """The maze of a chunk, generated on first use, including its doors to the chunks north and west of it."""
+        key = (cx, cy)
+        try:
+            self._chunks.move_to_end(key)
+            return self._chunks[key]
+        except KeyError:
+            pass
+
+        m = self._generator.generate(
+            self.chunk_width, self.chunk_height, seed=_hash(self.world_seed, "chunk", cx, cy))
+        if self._parent(cx, cy) == _NORTH or self._parent(cx, cy - 1) == _SOUTH:
+            m.set_value(0, 2 * self._door(cx, cy, _NORTH) + 1, ROAD)
+        if self._parent(cx, cy) == _WEST or self._parent(cx - 1, cy) == _EAST:
+            m.set_value(2 * self._door(cx, cy, _WEST) + 1, 0, ROAD)
+
+        self._chunks[key] = m
+        if len(self._chunks) > self.cache_size:
+            self._chunks.popitem(last=False)
+        return m
+
+    def _locate(self, row: int, col: int) -> tp.Tuple[Maze, int, int]:
+        cy, local_row = divmod(row, 2 * self.chunk_height)
+        cx, local_col = divmod(col, 2 * self.chunk_width)
+        return self.chunk(cx, cy), local_row, local_col
+
+    def get_value(self, row: int, col: int) -> int:
+        """Integer cell code at a grid position."""
+        m, local_row, local_col = self._locate(row, col)
+        return m.get_value(local_row, local_col)
+
+    def get(self, row: int, col: int) -> CellType:
+        return CELL_TYPES[self.get_value(row, col)]
+
+    def window(self, row: int, col: int, height: int, width: int) -> tp.List[bytes]:
+        """Integer cell codes of a rectangle of the grid, materializing only the chunks it overlaps.
+
+        Args:
+            row (int): top row
+            col (int): left column
+            height (int): number of rows
+            width (int): number of columns
+        Returns:
+            list: one bytes object of ``width`` codes per row
+        """
+        chunk_rows = 2 * self.chunk_height
+        chunk_cols = 2 * self.chunk_width
+        rows = []
+        for r in range(row, row + height):
+            cy, local_row = divmod(r, chunk_rows)
+            parts = []
+            c = col
+            while c < col + width:
+                cx, local_col = divmod(c, chunk_cols)
+                stop = min(chunk_cols, local_col + col + width - c)
+                parts.append(self.chunk(cx, cy).get_row(local_row)[local_col:stop])
+                c += stop - local_col
+            rows.append(b"".join(parts))
+        return rows
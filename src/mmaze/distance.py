@@ -0,0 +1,223 @@
+import typing as tp
+from array import array
+
+from mmaze.cell import WALL
+
+# preorder keys per block of the tree path index sparse table
+_BLOCK = 16
+
+
+class DistanceField:
+    """Breadth first distances from every cell to one target cell, with the next cell on a shortest path to it.
+
+    Cells are numbered ``row * base_width + col``, in cell coordinates. Built with one flood from the target,
+    after which the shortest path from any start is read in time linear in its length.
+
+    Args:
+        maze (Maze): maze to flood
+        target (tuple): target cell, in cell coordinates
+    """
+
+    def __init__(self, maze, target: tp.Sequence[int]):
+        base_width = maze.base_width
+        base_height = maze.base_height
+        maze_width = maze.width
+        grid = maze.grid
+        self.target = (target[0], target[1])
+        self.base_width = base_width
+        # distance in cells to the target, -1 when it is not reachable
+        self.distance = array("i", [-1]) * (base_width * base_height)
+        # number of the next cell toward the target, -1 for the target and for unreachable cells
+        self.next_step = array("i", [-1]) * (base_width * base_height)
+
+        distance = self.distance
+        next_step = self.next_step
+        root = target[0] * base_width + target[1]
+        distance[root] = 0
+        queue = [root]
+        head = 0
+        while head < len(queue):
+            k = queue[head]
+            head += 1
+            r, c = divmod(k, base_width)
+            i = (2 * r + 1) * maze_width + 2 * c + 1
+            d = distance[k] + 1
+            for n, step, inside in (
+                    (k - base_width, -maze_width, r > 0),
+                    (k + base_width, maze_width, r < base_height - 1),
+                    (k - 1, -1, c > 0),
+                    (k + 1, 1, c < base_width - 1),
+            ):
+                if inside and distance[n] < 0 and grid[i + step] != WALL and grid[i + 2 * step] != WALL:
+                    distance[n] = d
+                    next_step[n] = k
+                    queue.append(n)
+
+    def get_distance(self, start: tp.Sequence[int]) -> int:
+        """number of cells to walk from start to the target, -1 when it is not reachable"""
+        return self.distance[start[0] * self.base_width + start[1]]
+
+    def path(self, start: tp.Sequence[int]) -> tp.List[tp.Tuple[int, int]]:
+        """Shortest path from start to the target, in maze coordinates, midpoints and both ends included.
+
+        Args:
+            start (tuple): start cell, in cell coordinates
+        Returns:
+            list: maze positions from start to the target, empty when the target is not reachable
+        """
+        k = start[0] * self.base_width + start[1]
+        if self.distance[k] < 0:
+            return []
+        base_width = self.base_width
+        next_step = self.next_step
+        r, c = divmod(k, base_width)
+        path = [(2 * r + 1, 2 * c + 1)]
+        for _ in range(self.distance[k]):
+            k = next_step[k]
+            r_, c_ = divmod(k, base_width)
+            path.append((r + r_ + 1, c + c_ + 1))
+            path.append((2 * r_ + 1, 2 * c_ + 1))
+            r, c = r_, c_
+        return path
+
+    def solutions(self, start: tp.Sequence[int]) -> tp.List[list]:
+        """Shortest path from start to the target in the format of ``mmaze.solve``: one solution, without
+        its start and end cells, or no solution when the target is not reachable."""
+        path = self.path(start)
+        if not path:
+            return []
+        if len(path) > 1:
+            path = path[1:-1]
+        return [path]
+
+
+class TreePathIndex:
+    """Distances and paths between any two cells of a perfect maze, without searching.
+
+    The maze is rooted at its first cell and walked depth first once, recording the parent, the depth and the
+    preorder of every cell. The lowest common ancestor of two cells is the parent of the shallowest cell in the
+    preorder range between them. Cells are keyed ``depth << 32 | cell`` in preorder, and the range minimum is
+    taken over at most two partial blocks of keys plus a sparse table over the block minima, in O(1).
+
+    Args:
+        maze (Maze): perfect maze, a spanning tree over its cells
+    Raises:
+        ValueError: when the maze has a loop or a cell not connected to the others
+    """
+
+    def __init__(self, maze):
+        base_width = maze.base_width
+        base_height = maze.base_height
+        maze_width = maze.width
+        grid = maze.grid
+        n = base_width * base_height
+        self.base_width = base_width
+        self.parent = array("i", [-1]) * n
+        self.depth = array("i", [-1]) * n
+        # position of every cell in the preorder
+        self.order = array("i", [0]) * n
+
+        parent = self.parent
+        depth = self.depth
+        keys = array("q")
+        depth[0] = 0
+        stack = [0]
+        while stack:
+            k = stack.pop()
+            self.order[k] = len(keys)
+            keys.append(depth[k] << 32 | k)
+            r, c = divmod(k, base_width)
+            i = (2 * r + 1) * maze_width + 2 * c + 1
+            for m, step, inside in (
+                    (k - base_width, -maze_width, r > 0),
+                    (k + base_width, maze_width, r < base_height - 1),
+                    (k - 1, -1, c > 0),
+                    (k + 1, 1, c < base_width - 1),
+            ):
+                if not inside or m == parent[k] or grid[i + step] == WALL or grid[i + 2 * step] == WALL:
+                    continue
+                if depth[m] >= 0:
+                    raise ValueError("the maze has a loop, it is not a perfect maze")
+                parent[m] = k
+                depth[m] = depth[k] + 1
+                stack.append(m)
+        if len(keys) < n:
+            raise ValueError("the maze has unreachable cells, it is not a perfect maze")
+
+        self.keys = keys
+        # table[j][t] is the smallest key of the blocks t .. t + 2 ** j - 1
+        blocks = array("q", map(min, (keys[t:t + _BLOCK] for t in range(0, n, _BLOCK))))
+        self.table = [blocks]
+        step = 1
+        while 2 * step <= len(blocks):
+            previous = self.table[-1]
+            self.table.append(array("q", map(min, previous[:len(previous) - step], previous[step:])))
+            step *= 2
+
+    def _number(self, cell: tp.Sequence[int]) -> int:
+        return cell[0] * self.base_width + cell[1]
+
+    def _lca(self, a: int, b: int) -> int:
+        if a == b:
+            return a
+        left, right = self.order[a], self.order[b]
+        if left > right:
+            left, right = right, left
+        left += 1
+        keys = self.keys
+        first, last = left // _BLOCK, right // _BLOCK
+        if first == last:
+            key = min(keys[left:right + 1])
+        else:
+            key = min(min(keys[left:(first + 1) * _BLOCK]), min(keys[last * _BLOCK:right + 1]))
+            if first + 1 < last:
+                j = (last - first - 1).bit_length() - 1
+                level = self.table[j]
+                key = min(key, level[first + 1], level[last - (1 << j)])
+        return self.parent[key & 0xffffffff]
+
+    def lca(self, a: tp.Sequence[int], b: tp.Sequence[int]) -> tp.Tuple[int, int]:
+        """the cell where the paths from a and from b to the root meet, in cell coordinates"""
+        return divmod(self._lca(self._number(a), self._number(b)), self.base_width)
+
+    def distance(self, a: tp.Sequence[int], b: tp.Sequence[int]) -> int:
+        """number of cells to walk from a to b"""
+        a, b = self._number(a), self._number(b)
+        return self.depth[a] + self.depth[b] - 2 * self.depth[self._lca(a, b)]
+
+    def path(self, a: tp.Sequence[int], b: tp.Sequence[int]) -> tp.List[tp.Tuple[int, int]]:
+        """The path from a to b, in maze coordinates, midpoints and both ends included.
+
+        Args:
+            a (tuple): start cell, in cell coordinates
+            b (tuple): end cell, in cell coordinates
+        Returns:
+            list: maze positions from a to b
+        """
+        a, b = self._number(a), self._number(b)
+        top = self._lca(a, b)
+        up = self._climb(a, top)
+        down = self._climb(b, top)
+        down.reverse()
+        return up + down[1:]
+
+    def _climb(self, k: int, top: int) -> tp.List[tp.Tuple[int, int]]:
+        """maze positions from cell k up to its ancestor top, both included"""
+        base_width = self.base_width
+        parent = self.parent
+        r, c = divmod(k, base_width)
+        path = [(2 * r + 1, 2 * c + 1)]
+        while k != top:
+            k = parent[k]
+            r_, c_ = divmod(k, base_width)
+            path.append((r + r_ + 1, c + c_ + 1))
+            path.append((2 * r_ + 1, 2 * c_ + 1))
+            r, c = r_, c_
+        return path
+
+    def solutions(self, a: tp.Sequence[int], b: tp.Sequence[int]) -> tp.List[list]:
+        """The path from a to b in the format of ``mmaze.solve``: one solution, without its start and end cells."""
+        path = self.path(a, b)
+        if len(path) > 1:
+            path = path[1:-1]
+        return [path]
@@ -1,4 +1,4 @@
-from mmaze.generator.base import BaseMazeGenerator, set_cell
+from mmaze.generator.base import BaseMazeGenerator, CarvingKernel
 from mmaze.maze import Maze
 from mmaze.cell import CellType
 
@@ -13,22 +13,8 @@ class Backtracking(BaseMazeGenerator):
     """
     symmetry_ok = True
 
-    def _generate(self, width: int, height: int, symmetry: str = "none") -> Maze:
-        m = Maze(width, height, cell_type=CellType.WALL)
-
+    def _generate(self, width: int, height: int, **kwargs) -> Maze:
+        m = self._new_maze(width, height, CellType.WALL)
         row, col = m.random_position()
-        track = []
-        set_cell(m, (row, col), CellType.ROAD, symmetry, track)
-
-        while track:
-            (row, col) = track[-1]
-            neighbors = m.find_neighbors(row, col, is_wall=True)
-
-            if len(neighbors) == 0:
-                track = track[:-1]
-            else:
-                row_, col_ = neighbors[0]
-                set_cell(m, (row_, col_), CellType.ROAD, symmetry, track)
-                set_cell(m, ((row_ + row) // 2, (col_ + col) // 2), CellType.ROAD, symmetry)
-
+        CarvingKernel(m).backtrack(row * m.width + col, self.rng)
         return m
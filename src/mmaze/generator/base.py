@@ -1,73 +1,277 @@
-import logging
 import typing as tp
 import random
+from array import array
 from abc import ABCMeta, abstractmethod
 
 from mmaze.maze import Maze
-from mmaze.cell import CellType
+from mmaze.cell import CellType, ROAD, WALL
+
+
+SYMMETRIES = ("none", "n", "vertical", "v", "horizontal", "h", "both", "b")
+# grid codes to visited flags, only walls are not visited
+_VISITED = bytes(int(code != WALL) for code in range(256))
 
 
 class BaseMazeGenerator(metaclass=ABCMeta):
     symmetry_ok: bool
 
-    def generate(self, width: int, height: int, symmetry: str = "none", seed: tp.Optional[int] = None):
+    def __init__(self, rng: tp.Optional[random.Random] = None):
+        # every random draw of the generator comes from this instance, not from the global random module,
+        # so generators can run concurrently; share one generator instance between threads only with a lock
+        self.rng = rng if rng is not None else random.Random()
+        self._storage = "bytearray"
+        self._path = None
+
+    def generate(
+            self,
+            width: int,
+            height: int,
+            symmetry: str = "none",
+            seed: tp.Optional[int] = None,
+            storage: str = "bytearray",
+            path: tp.Optional[str] = None,
+    ):
+        """Generate a maze.
+
+        Args:
+            width (int): maze width in cells
+            height (int): maze height in cells
+            symmetry (str): one of "horizontal", "vertical", "both", "none"
+            seed (int): random seed
+            storage (str): grid storage of the maze, "bytearray", "numpy" or "mmap"
+            path (str): file backing the maze when storage is "mmap"
+        Returns:
+            Maze: the generated maze
+        """
+        self._storage = storage
+        self._path = path
+        if symmetry not in SYMMETRIES:
+            raise ValueError(
+                f"symmetry must be one of "
+                f"[\"horizontal\", \"vertical\", \"both\", \"none\"], but got {symmetry}")
         if symmetry not in ("n", "none") and not self.symmetry_ok:
             raise ValueError("symmetry must be 'none' for this generator, "
                              "or you can use backtracking/growingtree/huntandkill/prims"
                              " to generate symmetric maze")
         if seed is not None:
-            random.seed(seed)
+            self.rng.seed(seed)
 
-        if self.symmetry_ok:
-            if symmetry[0].lower() == "v" and height % 2 == 0:
-                logging.warning("if with vertical symmetry, height must be odd number to ensure maze connection.")
-            elif symmetry[0].lower() == "h" and width % 2 == 0:
-                logging.warning("if with horizontal symmetry, width must be odd number to ensure maze connection.")
-            elif symmetry[0].lower() == "b" and width % 2 == 0 and height % 2 == 0:
-                logging.warning("if with both vertical and horizontal symmetry,"
-                                " height and width must be odd number to ensure maze connection.")
+        if symmetry in ("n", "none"):
+            return self._generate(width, height)
+        return self._generate_symmetric(width, height, symmetry)
 
-            return self._generate(width, height, symmetry=symmetry)
-        return self._generate(width, height)
+    def _generate_symmetric(self, width: int, height: int, symmetry: str) -> Maze:
+        """Generate the top left half or quarter, including the middle row or column when the size is odd,
+        and mirror it into the full maze row by row. When the size is even, a door is opened in the wall
+        between the mirrored parts, at mirrored positions, to keep the maze connected."""
+        mirror_rows = symmetry in ("vertical", "v", "both", "b")
+        mirror_cols = symmetry in ("horizontal", "h", "both", "b")
+        region_width = (width + 1) // 2 if mirror_cols else width
+        region_height = (height + 1) // 2 if mirror_rows else height
+
+        # the region is scratch space, keep it in memory whatever the storage of the result
+        storage, path = self._storage, self._path
+        self._storage, self._path = "bytearray", None
+        try:
+            region = self._generate(region_width, region_height)
+        finally:
+            self._storage, self._path = storage, path
+
+        m = self._new_maze(width, height, CellType.WALL)
+        # rows and columns up to the middle come from the region, the middle one being a seam wall for even sizes
+        for row in range(height + 1 if mirror_rows else m.height):
+            values = region.get_row(row)
+            if mirror_cols:
+                values = values[:width + 1]
+                values += values[-2::-1]
+            m.set_row(row, values)
+            if mirror_rows:
+                m.set_row(m.height - 1 - row, values)
+
+        if mirror_rows and height % 2 == 0:
+            col = self.rng.randrange(region_width) * 2 + 1
+            m.set_value(height, col, ROAD)
+            if mirror_cols:
+                m.set_value(height, m.width - 1 - col, ROAD)
+        if mirror_cols and width % 2 == 0:
+            row = self.rng.randrange(region_height) * 2 + 1
+            m.set_value(row, width, ROAD)
+            if mirror_rows:
+                m.set_value(m.height - 1 - row, width, ROAD)
+        return m
 
     @abstractmethod
     def _generate(self, width: int, height: int, **kwargs) -> Maze:
         ...
 
+    def _new_maze(self, width: int, height: int, cell_type: CellType) -> Maze:
+        """Allocate the maze to carve into, using the storage requested in ``generate``."""
+        return Maze(width, height, cell_type, storage=self._storage, path=self._path, rng=self.rng)
+
+
+def carve_cell(m: Maze, pos: tuple, frontier: "IndexedSet"):
+    """Open a cell, moving it out of the frontier and its walled-in neighbor cells into it.
+
+    Args:
+        m (Maze): maze
+        pos (tuple): cell to open, in maze coordinates
+        frontier (IndexedSet): unvisited cells next to a visited one, by cell number row * base_width + col
+    """
+    grid = m.grid
+    maze_width = m.width
+    base_width = m.base_width
+    r, c = pos
+    m.set_value(r, c, ROAD)
+    number = r // 2 * base_width + c // 2
+    frontier.remove(number)
+    i = r * maze_width + c
+    if r > 1 and grid[i - 2 * maze_width] == WALL:
+        frontier.add(number - base_width)
+    if r < m.height - 2 and grid[i + 2 * maze_width] == WALL:
+        frontier.add(number + base_width)
+    if c > 1 and grid[i - 2] == WALL:
+        frontier.add(number - 1)
+    if c < maze_width - 2 and grid[i + 2] == WALL:
+        frontier.add(number + 1)
+
+
+class CarvingKernel:
+    """Carve passages into a maze by flat grid index.
+
+    A cell is the index ``row * maze.width + col`` of its grid position. Its neighbor cells are at fixed offsets
+    of two rows or two columns, and a visited bitmap, padded by two rows on both ends, marks every wall position
+    and everything out of the maze as visited, so neighbors need no bound checks.
+
+    Args:
+        m (Maze): maze to carve into, cells already open count as visited
+    """
+
+    def __init__(self, m: Maze):
+        self.grid = m.grid
+        width = m.width
+        self.offsets = (-2 * width, 2 * width, -2, 2)
+        self._pad = 2 * width
+        self.visited = bytearray([1]) * (len(m.grid) + 2 * self._pad)
+        for row in range(1, m.height, 2):
+            start = self._pad + row * width + 1
+            self.visited[start:start + width - 2:2] = m.get_row(row)[1::2].translate(_VISITED)
+
+    def unvisited(self, i: int) -> tp.List[int]:
+        """unvisited neighbor cells of cell i"""
+        visited = self.visited
+        j = i + self._pad
+        return [i + o for o in self.offsets if not visited[j + o]]
 
-def set_cell(m: Maze, pos: tuple, cell_type: CellType, symmetry: str, keep: list = None, remove: list = None) -> list:
-    m.set(pos[0], pos[1], cell_type)
-    new_set = {(pos[0], pos[1])}
-    if symmetry in ("none", "n"):
-        pass
-    elif symmetry in ("vertical", "v"):
-        r, c = m.height - 1 - pos[0], pos[1]
-        m.set(r, c, cell_type)
-        new_set.add((r, c))
-    elif symmetry in ("horizontal", "h"):
-        r, c = pos[0], m.width - 1 - pos[1]
-        m.set(r, c, cell_type)
-        new_set.add((r, c))
-    elif symmetry in ("both", "b"):
-        r1, c1 = m.height - 1 - pos[0], m.width - 1 - pos[1]
-        m.set(r1, c1, cell_type)
-        r2, c2 = m.height - 1 - pos[0], pos[1]
-        m.set(r2, c2, cell_type)
-        r3, c3 = pos[0], m.width - 1 - pos[1]
-        m.set(r3, c3, cell_type)
-        new_set.update({(r1, c1), (r2, c2), (r3, c3)})
-    else:
-        raise ValueError(
-            f"symmetry must be one of "
-            f"[\"horizontal\", \"vertical\", \"both\", \"none\"], but got {symmetry}")
-    if keep is not None:
-        tmp = set(keep)
-        tmp.update(new_set)
-        keep[:] = list(tmp)
-    if remove is not None:
-        for n in new_set:
-            try:
-                remove.remove(n)
-            except ValueError:
+    def carve(self, i: int, j: int):
+        """open the neighbor cell j of cell i, and the wall between them"""
+        self.grid[(i + j) // 2] = ROAD
+        self.grid[j] = ROAD
+        self.visited[j + self._pad] = 1
+
+    def backtrack(self, start: int, rng: random.Random):
+        """Carve a depth first spanning tree over the unvisited cells reachable from cell start,
+        backing up on a stack that is pushed and popped in place."""
+        grid = self.grid
+        visited = self.visited
+        pad = self._pad
+        up, down, left, right = self.offsets
+        grid[start] = ROAD
+        visited[start + pad] = 1
+        stack = [start]
+        while stack:
+            i = stack[-1]
+            j = i + pad
+            candidates = []
+            if not visited[j + up]:
+                candidates.append(i + up)
+            if not visited[j + down]:
+                candidates.append(i + down)
+            if not visited[j + left]:
+                candidates.append(i + left)
+            if not visited[j + right]:
+                candidates.append(i + right)
+
+            if not candidates:
+                stack.pop()
                 continue
-    return list(new_set)
+            n = candidates[rng.randrange(len(candidates))] if len(candidates) > 1 else candidates[0]
+            grid[(i + n) // 2] = ROAD
+            grid[n] = ROAD
+            visited[n + pad] = 1
+            stack.append(n)
+
+
+class DisjointSet:
+    """Union-find over the integers ``0..n-1`` on flat arrays, with path compression and union by rank."""
+
+    def __init__(self, n: int):
+        self.parent = array("i", range(n))
+        self.rank = bytearray(n)
+        # number of disjoint sets left
+        self.count = n
+
+    def find(self, x: int) -> int:
+        parent = self.parent
+        root = x
+        while parent[root] != root:
+            root = parent[root]
+        while parent[x] != root:
+            parent[x], x = root, parent[x]
+        return root
+
+    def union(self, a: int, b: int) -> bool:
+        """Merge the sets of a and b.
+
+        Returns:
+            bool: False if they were in the same set already
+        """
+        a = self.find(a)
+        b = self.find(b)
+        if a == b:
+            return False
+        rank = self.rank
+        if rank[a] < rank[b]:
+            a, b = b, a
+        self.parent[b] = a
+        if rank[a] == rank[b]:
+            rank[a] += 1
+        self.count -= 1
+        return True
+
+
+class IndexedSet:
+    """Set over the integers ``0..n-1``: a dense item array with swap-remove plus the position of every item in it,
+    giving O(1) add, remove, membership test and random pick."""
+
+    def __init__(self, n: int, full: bool = False):
+        if full:
+            self.items = array("l", range(n))
+            self.position = array("l", range(n))
+        else:
+            self.items = array("l")
+            self.position = array("l", [-1]) * n
+
+    def __len__(self):
+        return len(self.items)
+
+    def __contains__(self, x: int) -> bool:
+        return self.position[x] >= 0
+
+    def add(self, x: int):
+        if self.position[x] < 0:
+            self.position[x] = len(self.items)
+            self.items.append(x)
+
+    def remove(self, x: int):
+        i = self.position[x]
+        if i < 0:
+            return
+        last = self.items.pop()
+        if last != x:
+            self.items[i] = last
+            self.position[last] = i
+        self.position[x] = -1
+
+    def pick(self, rng: random.Random) -> int:
+        """a uniformly random item"""
+        return self.items[rng.randrange(len(self.items))]
@@ -1,56 +1,112 @@
 import random
+import typing as tp
 
 from mmaze.generator.base import BaseMazeGenerator
 from mmaze.maze import Maze
-from mmaze.cell import CellType
+from mmaze.cell import CellType, ROAD, WALL
+
+SKEWES = {
+    "NW": [(1, 0), (0, -1)],
+    "NE": [(1, 0), (0, 1)],
+    "SW": [(-1, 0), (0, -1)],
+    "SE": [(-1, 0), (0, 1)],
+}
+
+# ascii bits to choices, and choices to the code of the wall on the row or on the column of a cell
+_BITS = bytes.maketrans(b"01", b"\x00\x01")
+_ROW_WALL = bytes.maketrans(b"\x00\x01", bytes([ROAD, WALL]))
+_COL_WALL = bytes.maketrans(b"\x00\x01", bytes([WALL, ROAD]))
 
 
 class BinaryTree(BaseMazeGenerator):
-    """For every cell in the grid, knock down a wall either North or West."""
+    """For every cell in the grid, knock down a wall either North or West.
+
+    Every choice is independent, so the choices of a row are drawn as one block of random bits and written a row at
+    a time, or the whole grid at once when numpy is installed and the maze is in memory. Both ways produce the same
+    maze.
+    """
     symmetry_ok = False
 
-    def __init__(self, skew=None):
-        super().__init__()
-        skewes = {
-            "NW": [(1, 0), (0, -1)],
-            "NE": [(1, 0), (0, 1)],
-            "SW": [(-1, 0), (0, -1)],
-            "SE": [(-1, 0), (0, 1)],
-        }
-        if skew in skewes:
-            self.skew = skewes[skew]
-        else:
-            key = random.choice(list(skewes.keys()))
-            self.skew = skewes[key]
+    def __init__(self, skew=None, rng: tp.Optional[random.Random] = None):
+        super().__init__(rng=rng)
+        # without a valid skew, a random one is drawn for every maze
+        self.skew = SKEWES.get(skew)
 
     def _generate(self, width: int, height: int, **kwargs) -> Maze:
-        m = Maze(width, height, CellType.WALL)
+        m = self._new_maze(width, height, CellType.WALL)
+        skew = self.skew if self.skew is not None else self.rng.choice(list(SKEWES.values()))
+        if m.storage == "mmap":
+            # a file backed maze may not fit in memory, only one row is held at a time
+            self._carve_rows(m, skew, self.rng)
+            return m
+        try:
+            import numpy  # pylint: disable=unused-import
+        except ModuleNotFoundError:
+            self._carve_rows(m, skew, self.rng)
+        else:
+            self._carve_grid(m, skew, self.rng)
+        return m
 
-        for row in range(1, m.height, 2):
-            for col in range(1, m.width, 2):
-                m.set(row, col, CellType.ROAD)
-                neighbor_row, neighbor_col = self._find_neighbor(m.width, m.height, row, col)
-                m.set(neighbor_row, neighbor_col, CellType.ROAD)
+    @staticmethod
+    def _row_bits(width: int, rng: random.Random) -> int:
+        """one random bit per cell of a row, set to carve along the column, clear to carve along the row"""
+        return rng.getrandbits(width) if width > 0 else 0
 
-        return m
+    @staticmethod
+    def _carve_rows(m: Maze, skew: list, rng: random.Random):
+        """Write the maze a row at a time, with byte translations and slice assignment.
+
+        Args:
+            skew (list): the two directions to carve to
+            rng (random.Random): random generator, drawn once per row but the edge one
+        """
+        (d_row, _), (_, d_col) = skew
+        width, height = m.base_width, m.base_height
+        edge_row = height - 1 if d_row > 0 else 0
+        edge_col = width - 1 if d_col > 0 else 0
+        cell_row = bytearray([WALL]) * m.width
+        cell_row[1::2] = bytes([ROAD]) * width
+        wall_row = bytearray([WALL]) * m.width
+
+        for row in range(height):
+            if row == edge_row:
+                choice = bytearray(width)
+            else:
+                bits = BinaryTree._row_bits(width, rng)
+                choice = bytearray(format(bits, f"0{width}b").encode().translate(_BITS))
+                choice[edge_col] = 1
+            cell_row[2:m.width - 1:2] = (choice[1:] if d_col < 0 else choice[:-1]).translate(_ROW_WALL)
+            m.set_row(row * 2 + 1, cell_row)
+            if row != edge_row:
+                wall_row[1::2] = choice.translate(_COL_WALL)
+                m.set_row(row * 2 + 1 + d_row, wall_row)
 
-    def _find_neighbor(self, maze_width: int, maze_height: int, row: int, col: int):
-        """Find a neighbor in the skewed direction.
+    @staticmethod
+    def _carve_grid(m: Maze, skew: list, rng: random.Random):
+        """Write the whole maze at once with numpy, making the same choices as ``_carve_rows``.
 
         Args:
-            row (int): row number
-            col (int): col number
-        Returns:
-            tuple: position of the randomly-chosen neighbor
+            skew (list): the two directions to carve to
+            rng (random.Random): random generator, drawn once per row but the edge one
         """
-        neighbors = []
-        for b_row, b_col in self.skew:
-            neighbor_row = row + b_row
-            neighbor_col = col + b_col
-            if 0 < neighbor_row < (maze_height - 1) and 0 < neighbor_col < (maze_width - 1):
-                neighbors.append((neighbor_row, neighbor_col))
-
-        if len(neighbors) == 0:
-            return row, col
+        import numpy as np
+        (d_row, _), (_, d_col) = skew
+        width, height = m.base_width, m.base_height
+        edge_row = height - 1 if d_row > 0 else 0
+        n_bytes = (width + 7) // 8
+        data = b"".join(
+            BinaryTree._row_bits(width, rng).to_bytes(n_bytes, "big") if row != edge_row else bytes(n_bytes)
+            for row in range(height))
+        choice = np.unpackbits(np.frombuffer(data, dtype=np.uint8)).reshape(height, n_bytes * 8)
+        choice = choice[:, n_bytes * 8 - width:]
+        choice[:, width - 1 if d_col > 0 else 0] = 1
+        choice[edge_row] = 0
+
+        grid = np.full((m.height, m.width), WALL, dtype=np.uint8)
+        grid[1::2, 1::2] = ROAD
+        grid[1::2, 2:m.width - 1:2] = np.where(choice[:, 1:] if d_col < 0 else choice[:, :-1], WALL, ROAD)
+        grid[2:m.height - 1:2, 1::2] = np.where(choice[1:] if d_row < 0 else choice[:-1], ROAD, WALL)
+        if m.storage == "numpy":
+            m.grid[:] = grid.ravel()
         else:
-            return random.choice(neighbors)
+            m.grid[:] = grid.tobytes()
@@ -1,11 +1,100 @@
+import os
 import random
+import typing as tp
+from concurrent.futures import ProcessPoolExecutor
 
 from mmaze.generator.base import BaseMazeGenerator
-from mmaze.maze import Maze, CellType
+from mmaze.cell import CellType, ROAD, WALL
 
 # CONSTANTS
 VERTICAL = 0
 HORIZONTAL = 1
+# regions of at most this many grid cells are divided as independent tasks, each from its own derived seed
+TASK_CELLS = 2 ** 16
+# mazes of at least this many grid cells divide their tasks over a pool of processes
+PARALLEL_CELLS = 2 ** 21
+
+
+def _divide(grid: memoryview, maze_width: int, region_stack: list, rng: random.Random, task_cells: int = 0) -> list:
+    """Bisect regions of the grid until the maze passages are the desired resolution.
+
+    Args:
+        grid (memoryview): flat row major grid to draw the walls into
+        maze_width (int): width of the grid
+        region_stack (list): ((min_y, min_x), (max_y, max_x)) regions to divide, consumed
+        rng (random.Random): random generator
+        task_cells (int): leave the regions of at most this many grid cells undivided
+    Returns:
+        list: the regions left undivided, in the order they were reached
+    """
+    tasks = []
+    while region_stack:
+        current_region = region_stack.pop()
+        (min_y, min_x), (max_y, max_x) = current_region
+        height = max_y - min_y + 1
+        width = max_x - min_x + 1
+
+        if height * width <= task_cells:
+            tasks.append(current_region)
+            continue
+        if height <= 1 or width <= 1:
+            continue
+
+        if width < height:
+            cut_direction = HORIZONTAL  # with 100% chance
+        elif width > height:
+            cut_direction = VERTICAL  # with 100% chance
+        else:
+            if width == 2:
+                continue
+            cut_direction = rng.randrange(2)
+
+        # MAKE CUT
+        # select cut position (can't be completely on the edge of the region)
+        cut_length = (height, width)[(cut_direction + 1) % 2]
+        if cut_length < 3:
+            continue
+        cut_posi = rng.randrange(1, cut_length, 2)
+        # select new door position
+        door_posi = rng.randrange(0, (height, width)[cut_direction], 2)
+        # add walls to correct places
+        if cut_direction == VERTICAL:
+            start = min_y * maze_width + min_x + cut_posi
+            grid[start:start + (height - 1) * maze_width + 1:maze_width] = bytes([WALL]) * height
+            grid[start + door_posi * maze_width] = ROAD
+
+            # add new regions to stack
+            region_stack.append(((min_y, min_x), (max_y, min_x + cut_posi - 1)))
+            region_stack.append(((min_y, min_x + cut_posi + 1), (max_y, max_x)))
+
+        else:  # horizontal
+            start = (min_y + cut_posi) * maze_width + min_x
+            grid[start:start + width] = bytes([WALL]) * width
+            grid[start + door_posi] = ROAD
+
+            # add new regions to stack
+            region_stack.append(((min_y, min_x), (min_y + cut_posi - 1, max_x)))
+            region_stack.append(((min_y + cut_posi + 1, min_x), (max_y, max_x)))
+    return tasks
+
+
+def _shared_memory():
+    """the multiprocessing.shared_memory module, None before python 3.8"""
+    try:
+        from multiprocessing import shared_memory
+    except ImportError:
+        return None
+    return shared_memory
+
+
+def _divide_tasks(name: str, maze_width: int, jobs: tp.List[tuple]):
+    """Divide (region, seed) tasks of a grid in shared memory, inside a worker."""
+    shm = _shared_memory().SharedMemory(name=name)
+    try:
+        for region, seed in jobs:
+            _divide(shm.buf, maze_width, [region], random.Random(seed))
+    finally:
+        shm.close()
 
 
 class Division(BaseMazeGenerator):
@@ -14,68 +103,65 @@ class Division(BaseMazeGenerator):
     2. Build a wall that bisects the grid (horizontal or vertical). Add a single passage through the wall.
     3. Repeat step 2 with the areas on either side of the wall.
     4. Continue, recursively, until the maze passages are the desired resolution.
+
+    Once a region is small enough, it is divided on its own from a seed derived from the generator, so the
+    regions of large mazes can be spread over a pool of processes, and the maze does not depend on the
+    number of workers.
+
+    Optional Parameters
+
+    workers: int
+        Number of worker processes for large mazes, None for the number of CPUs; the default 1 divides in this
+        process, and so does every worker count before python 3.8. The pool needs an ``if __name__ == "__main__"`` guard in the calling script under the "spawn"
+        start method.
     """
     symmetry_ok = False
 
+    def __init__(
+            self,
+            workers: tp.Optional[int] = 1,
+            rng: tp.Optional[random.Random] = None,
+            task_cells: int = TASK_CELLS,
+            parallel_cells: int = PARALLEL_CELLS,
+    ):
+        super().__init__(rng=rng)
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.task_cells = task_cells
+        self.parallel_cells = parallel_cells
+
     def _generate(self, width: int, height: int, **kwargs):
         # create empty grid
-        m = Maze(width, height, cell_type=CellType.ROAD)
+        m = self._new_maze(width, height, CellType.ROAD)
         # fill borders
-        m.data[0] = [CellType.WALL for _ in range(len(m.data[0]))]
-        m.data[-1] = [CellType.WALL for _ in range(len(m.data[-1]))]
-        for i in range(m.height):
-            m.set(i, 0, CellType.WALL)
-            m.set(i, -1, CellType.WALL)
-
-        region_stack = [((1, 1), (m.height - 2, m.width - 2))]
-
-        while region_stack:
-            current_region = region_stack[-1]
-            region_stack = region_stack[:-1]
-            min_y = current_region[0][0]
-            max_y = current_region[1][0]
-            min_x = current_region[0][1]
-            max_x = current_region[1][1]
-            height = max_y - min_y + 1
-            width = max_x - min_x + 1
-
-            if height <= 1 or width <= 1:
-                continue
+        m.set_row(0, bytes([WALL]) * m.width)
+        m.set_row(m.height - 1, bytes([WALL]) * m.width)
+        m.set_col(0, bytes([WALL]) * m.height)
+        m.set_col(m.width - 1, bytes([WALL]) * m.height)
 
-            if width < height:
-                cut_direction = HORIZONTAL  # with 100% chance
-            elif width > height:
-                cut_direction = VERTICAL  # with 100% chance
+        with memoryview(m.grid) as grid:
+            tasks = _divide(grid, m.width, [((1, 1), (m.height - 2, m.width - 2))], self.rng, self.task_cells)
+            jobs = [(region, self.rng.getrandbits(64)) for region in tasks]
+            parallel = self.workers > 1 and len(jobs) > 1 and m.width * m.height >= self.parallel_cells
+            if parallel and _shared_memory() is not None:
+                self._divide_parallel(grid, m.width, jobs)
             else:
-                if width == 2:
-                    continue
-                cut_direction = random.randrange(2)
-
-            # MAKE CUT
-            # select cut position (can't be completely on the edge of the region)
-            cut_length = (height, width)[(cut_direction + 1) % 2]
-            if cut_length < 3:
-                continue
-            cut_posi = random.randrange(1, cut_length, 2)
-            # select new door position
-            door_posi = random.randrange(0, (height, width)[cut_direction], 2)
-            # add walls to correct places
-            if cut_direction == 0:  # vertical
-                for row in range(min_y, max_y + 1):
-                    m.set(row, min_x + cut_posi, CellType.WALL)
-                m.set(min_y + door_posi, min_x + cut_posi, CellType.ROAD)
-
-                # add new regions to stack
-                region_stack.append(((min_y, min_x), (max_y, min_x + cut_posi - 1)))
-                region_stack.append(((min_y, min_x + cut_posi + 1), (max_y, max_x)))
-
-            else:  # horizontal
-                for col in range(min_x, max_x + 1):
-                    m.set(min_y + cut_posi, col, CellType.WALL)
-                m.set(min_y + cut_posi, min_x + door_posi, CellType.ROAD)
-
-                # add new regions to stack
-                region_stack.append(((min_y, min_x), (min_y + cut_posi - 1, max_x)))
-                region_stack.append(((min_y + cut_posi + 1, min_x), (max_y, max_x)))
-
+                for region, seed in jobs:
+                    _divide(grid, m.width, [region], random.Random(seed))
         return m
+
+    def _divide_parallel(self, grid: memoryview, maze_width: int, jobs: tp.List[tuple]):
+        """Copy the grid to shared memory, divide the tasks over a pool of processes and copy the grid back."""
+        size = len(grid)
+        shm = _shared_memory().SharedMemory(create=True, size=size)
+        try:
+            shm.buf[:size] = grid
+            # a few chunks per worker, to balance the load
+            n_chunks = min(len(jobs), self.workers * 4)
+            chunks = [jobs[i::n_chunks] for i in range(n_chunks)]
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                for future in [executor.submit(_divide_tasks, shm.name, maze_width, c) for c in chunks]:
+                    future.result()
+            grid[:] = shm.buf[:size]
+        finally:
+            shm.close()
+            shm.unlink()
@@ -3,7 +3,7 @@ import typing as tp
 
 from mmaze.generator.base import BaseMazeGenerator
 from mmaze.maze import Maze
-from mmaze.cell import CellType
+from mmaze.cell import CellType, ROAD, WALL
 
 
 class Ellers(BaseMazeGenerator):
@@ -15,145 +15,162 @@ class Ellers(BaseMazeGenerator):
     4. Put any unconnected cells in the next row into their own set.
     5. Repeast until the last row.
     6. In the last row, join all adjacent cells that do not share a set.
+
+    Only the set labels of the current row are kept. Merges inside a row are recorded in a
+    per-row disjoint-set over the labels, so each row costs O(width), and ``iter_rows``
+    can stream rows of an arbitrarily tall maze.
     """
     symmetry_ok = False
 
-    def __init__(self, xskew=0.5, yskew=0.5):
-        super().__init__()
+    def __init__(self, xskew=0.5, yskew=0.5, rng: tp.Optional[random.Random] = None):
+        super().__init__(rng=rng)
         self.xskew = 0.0 if xskew < 0.0 else 1.0 if xskew > 1.0 else xskew
         self.yskew = 0.0 if yskew < 0.0 else 1.0 if yskew > 1.0 else yskew
 
     def _generate(self, width: int, height: int, **kwargs) -> Maze:
-        m = Maze(width, height, CellType.ROAD)
-        # create empty grid, with walls
-        sets = [[-1] * m.width for _ in range(m.height)]
-
-        # initialize the first row cells to each exist in their own set
-        max_set_number = 0
+        m = self._new_maze(width, height, CellType.WALL)
+        for r, row in enumerate(self._iter_rows(width, height)):
+            m.set_row(r, row)
+        return m
 
-        # process all but the last row
-        for r in range(1, m.height - 1, 2):
-            max_set_number = self._init_row(sets, r, max_set_number, m.width)
-            self._merge_one_row(sets, r, m.width, m.height)
-            self._merge_down_a_row(sets, r, m.width, m.height)
+    def iter_rows(
+            self, width: int, height: tp.Optional[int] = None, seed: tp.Optional[int] = None
+    ) -> tp.Iterator[bytes]:
+        """Stream the maze row by row, holding only O(width) state.
 
-        # process last row
-        _ = self._init_row(sets, m.height - 2, max_set_number, m.width)
-        self._process_last_row(sets, m.width, m.height)
+        Args:
+            width (int): maze width in cells
+            height (int): maze height in cells, or None for an endless maze
+            seed (int): random seed
+        Returns:
+            iterator: finished maze rows, ``width * 2 + 1`` cell codes each,
+                the same rows ``generate`` would put in its maze
+        """
+        if seed is not None:
+            self.rng.seed(seed)
+        return self._iter_rows(width, height)
+
+    def _iter_rows(self, width: int, height: tp.Optional[int]) -> tp.Iterator[bytes]:
+        maze_width = width * 2 + 1
+        wall_row = bytes([WALL]) * maze_width
+        yield wall_row
+        if height is not None and height < 1:
+            # a maze without cells is a single wall row
+            return
 
-        # translate grid cell sets into a maze
-        self._set_grid_from_sets(sets, m)
-        return m
+        # initialize the first row cells to each exist in their own set
+        sets = list(range(width))
+        max_set_number = width
+
+        r = 0
+        while True:
+            row = bytearray(wall_row)
+            row[1::2] = bytes([ROAD]) * width
+            parent = {}
+            self._merge_one_row(sets, parent, row)
+
+            if height is not None and r == height - 1:
+                # process last row
+                self._process_last_row(sets, parent, row)
+                yield bytes(row)
+                yield wall_row
+                return
+
+            below = bytearray(wall_row)
+            sets, max_set_number = self._merge_down_a_row(sets, below, max_set_number)
+            yield bytes(row)
+            yield bytes(below)
+            r += 1
 
     @staticmethod
-    def _init_row(sets, row, max_set_number, width):
-        """Initialize each cell in a row to its own set
+    def _find(parent: tp.Dict[int, int], s: int) -> int:
+        """find the label a set of the current row has been merged into
 
         Args:
-            sets (list): grid representation of row sets
-            row (int): row number
-            max_set_number (int): counter used to determine how many rows/sets are left to work on
+            parent (dict): merged set label to the label it was merged into
+            s (int): set label
         Returns:
-            int: latest counter for number of sets left to work on
+            int: label of the merged set
         """
-        for c in range(1, width, 2):
-            if sets[row][c] < 0:
-                sets[row][c] = max_set_number
-                max_set_number += 1
-
-        return max_set_number
+        root = s
+        while root in parent:
+            root = parent[root]
+        while s != root:
+            parent[s], s = root, parent[s]
+        return root
 
-    def _merge_one_row(self, sets: tp.List[tp.List[int]], r, width, height):
-        """randomly decide to merge cells within a column
+    def _merge_one_row(self, sets: tp.List[int], parent: tp.Dict[int, int], row: bytearray):
+        """randomly decide to merge adjacent cells within a row
 
         Args:
-            sets (list): grid representation of row sets
-            r (int): row number
+            sets (list): set label of each cell in the row
+            parent (dict): merged set label to the label it was merged into
+            row (bytearray): maze row to open the walls in
         Returns: None
         """
-        for c in range(1, width - 2, 2):
-            if random.random() < self.xskew:
-                if sets[r][c] != sets[r][c + 2]:
-                    sets[r][c + 1] = sets[r][c]
-                    self._merge_sets(sets, sets[r][c + 2], sets[r][c], width, height, max_row=r)
-
-    def _merge_down_a_row(self, sets, start_row, width, height):
+        for c in range(len(sets) - 1):
+            if self.rng.random() < self.xskew:
+                a = self._find(parent, sets[c])
+                b = self._find(parent, sets[c + 1])
+                if a != b:
+                    row[2 * c + 2] = ROAD
+                    parent[b] = a
+        for c, s in enumerate(sets):
+            sets[c] = self._find(parent, s)
+
+    def _merge_down_a_row(
+            self, sets: tp.List[int], below: bytearray, max_set_number: int
+    ) -> tp.Tuple[tp.List[int], int]:
         """Create vertical connections in the maze.
         For the current row, cut down at least one passage for each cell set.
 
         Args:
-            sets (list): grid representation of row sets
-            start_row (int): index of row to start merging from
-        Returns: None
+            sets (list): set label of each cell in the row
+            below (bytearray): maze row between this row and the next one
+            max_set_number (int): next unused set label
+        Returns:
+            tuple: set labels of the next row, and the next unused set label
         """
-        # this is not meant for the bottom row
-        if start_row == height - 2:
-            return
-
-        # count how many cells of each set exist in a row
-        set_counts = {}
-        for c in range(1, width, 2):
-            s = sets[start_row][c]
-            if s not in set_counts:
-                set_counts[s] = [c]
+        # collect the cells of each set in the row
+        set_cells = {}
+        for c, s in enumerate(sets):
+            if s not in set_cells:
+                set_cells[s] = [c]
             else:
-                set_counts[s] = set_counts[s] + [c]
+                set_cells[s].append(c)
 
+        next_sets = [-1] * len(sets)
         # merge down randomly, but at least once per set
-        for s in set_counts:
-            c = random.choice(set_counts[s])
-            sets[start_row + 1][c] = s
-            sets[start_row + 2][c] = s
-
-        for c in range(1, width - 2, 2):
-            if random.random() < self.yskew:
-                s = sets[start_row][c]
-                if sets[start_row + 1][c] == -1:
-                    sets[start_row + 1][c] = s
-                    sets[start_row + 2][c] = s
-
-    @staticmethod
-    def _merge_sets(sets, from_set, to_set, width, height, max_row=-1):
-        """merge two different sets of grid cells into one
-        To improve performance, the grid will only be searched up to some maximum row number.
-
-        Args:
-            sets (list): grid representation of row sets
-            from_set (int): set to merge FROM
-            to_set (int): set to merge TO
-            max_row (int): index of last row in the maze
-        Returns: None
-        """
-        if max_row < 0:
-            max_row = height - 1
-
-        for r in range(1, max_row + 1):
-            for c in range(1, width - 1):
-                if sets[r][c] == from_set:
-                    sets[r][c] = to_set
+        for s, cells in set_cells.items():
+            c = self.rng.choice(cells)
+            next_sets[c] = s
+            below[2 * c + 1] = ROAD
+
+        for c in range(len(sets) - 1):
+            if self.rng.random() < self.yskew:
+                if next_sets[c] == -1:
+                    next_sets[c] = sets[c]
+                    below[2 * c + 1] = ROAD
+
+        # put any unconnected cells of the next row into their own set
+        for c in range(len(next_sets)):
+            if next_sets[c] < 0:
+                next_sets[c] = max_set_number
+                max_set_number += 1
+        return next_sets, max_set_number
 
-    def _process_last_row(self, sets, width, height):
+    def _process_last_row(self, sets: tp.List[int], parent: tp.Dict[int, int], row: bytearray):
         """join all adjacent cells that do not share a set, and omit the vertical connections
 
         Args:
-            sets (list): grid representation of row sets
+            sets (list): set label of each cell in the row
+            parent (dict): merged set label to the label it was merged into
+            row (bytearray): maze row to open the walls in
         Returns: None
         """
-        r = height - 2
-        for c in range(1, width - 2, 2):
-            if sets[r][c] != sets[r][c + 2]:
-                sets[r][c + 1] = sets[r][c]
-                self._merge_sets(sets, sets[r][c + 2], sets[r][c], width, height)
-
-    @staticmethod
-    def _set_grid_from_sets(sets, maze: Maze) -> None:
-        """translate the maze sets into a maze grid
-
-        Args:
-            sets (list): grid representation of row sets
-        """
-
-        for r in range(maze.height):
-            for c in range(maze.width):
-                if sets[r][c] == -1:
-                    maze.set(r, c, CellType.WALL)
+        for c in range(len(sets) - 1):
+            a = self._find(parent, sets[c])
+            b = self._find(parent, sets[c + 1])
+            if a != b:
+                row[2 * c + 2] = ROAD
+                parent[b] = a
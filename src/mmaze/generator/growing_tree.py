@@ -1,8 +1,119 @@
 import random
+import typing as tp
+from array import array
 
-from mmaze.generator.base import BaseMazeGenerator, set_cell
+from mmaze.generator.base import BaseMazeGenerator, IndexedSet
 from mmaze.maze import Maze
-from mmaze.cell import CellType
+from mmaze.cell import CellType, ROAD
+
+
+class ActiveCells(IndexedSet):
+    """IndexedSet that also links its items in insertion order and tracks the middle one,
+    so the newest, oldest, middle and a random item are all picked and removed in O(1)."""
+
+    def __init__(self, n: int):
+        super().__init__(n)
+        self.prev = array("l", [-1]) * n
+        self.next = array("l", [-1]) * n
+        # insertion rank of every item, to tell whether it comes before the middle one
+        self.rank = array("q", [0]) * n
+        self.oldest = -1
+        self.newest = -1
+        self.middle = -1
+        self._added = 0
+
+    def add(self, x: int):
+        if x in self:
+            return
+        super().add(x)
+        self.rank[x] = self._added
+        self._added += 1
+        self.prev[x] = self.newest
+        self.next[x] = -1
+        if self.newest < 0:
+            self.oldest = self.middle = x
+        else:
+            self.next[self.newest] = x
+            # the middle item sits at index (len - 1) // 2, which moves on when len becomes odd
+            if len(self) % 2 == 1:
+                self.middle = self.next[self.middle]
+        self.newest = x
+
+    def remove(self, x: int):
+        if x not in self:
+            return
+        odd = len(self) % 2 == 1
+        if x == self.middle:
+            self.middle = self.prev[x] if odd else self.next[x]
+        elif self.rank[x] < self.rank[self.middle]:
+            if not odd:
+                self.middle = self.next[self.middle]
+        elif odd:
+            self.middle = self.prev[self.middle]
+
+        p, n = self.prev[x], self.next[x]
+        if p < 0:
+            self.oldest = n
+        else:
+            self.next[p] = n
+        if n < 0:
+            self.newest = p
+        else:
+            self.prev[n] = p
+        super().remove(x)
+
+
+class Newest:
+    """pick the most recently added cell, which makes the algorithm Recursive Backtracking"""
+
+    def select(self, active: ActiveCells, rng: random.Random) -> int:
+        return active.newest
+
+
+class RandomCell:
+    """pick a random cell, which makes the algorithm behave like Prim's"""
+
+    def select(self, active: ActiveCells, rng: random.Random) -> int:
+        return active.pick(rng)
+
+
+class Oldest:
+    """pick the earliest added cell, growing long straight corridors"""
+
+    def select(self, active: ActiveCells, rng: random.Random) -> int:
+        return active.oldest
+
+
+class Middle:
+    """pick the middle cell in insertion order"""
+
+    def select(self, active: ActiveCells, rng: random.Random) -> int:
+        return active.middle
+
+
+class Mix:
+    """pick with one of several strategies, chosen at random on every step in proportion to its weight
+
+    Args:
+        strategies (list): (strategy, weight) pairs
+    """
+
+    def __init__(self, strategies: tp.Sequence[tp.Tuple[tp.Any, float]]):
+        total = sum(w for _, w in strategies)
+        if total <= 0:
+            raise ValueError("the total weight of the strategies must be positive")
+        self.strategies = []
+        cumulative = 0.
+        for strategy, weight in strategies:
+            cumulative += weight / total
+            self.strategies.append((cumulative, strategy))
+
+    def select(self, active: ActiveCells, rng: random.Random) -> int:
+        r = rng.random()
+        for cumulative, strategy in self.strategies:
+            if r < cumulative:
+                return strategy.select(active, rng)
+        return self.strategies[-1][1].select(active, rng)
 
 
 class GrowingTree(BaseMazeGenerator):
@@ -18,34 +129,45 @@ class GrowingTree(BaseMazeGenerator):
     backtrack_chance: float [0.0, 1.0]
         Splits the logic to either use Recursive Backtracking (RB) or Prim's (random)
         to select the next cell to visit. (default 1.0)
+    strategy: Newest, RandomCell, Oldest, Middle or Mix
+        How to choose the cell from C, overrides backtrack_chance when given.
     """
     symmetry_ok = True
 
-    def __init__(self, backtrack_chance=1.0):
-        super().__init__()
+    def __init__(self, backtrack_chance=1.0, rng: tp.Optional[random.Random] = None, strategy=None):
+        super().__init__(rng=rng)
         self.backtrack_chance = backtrack_chance
+        if strategy is None:
+            if backtrack_chance >= 1:
+                strategy = Newest()
+            elif backtrack_chance <= 0:
+                strategy = RandomCell()
+            else:
+                strategy = Mix([(Newest(), backtrack_chance), (RandomCell(), 1 - backtrack_chance)])
+        self.strategy = strategy
 
-    def _generate(self, width: int, height: int, symmetry: str = "none") -> Maze:
-        m = Maze(width, height, CellType.WALL)
+    def _generate(self, width: int, height: int, **kwargs) -> Maze:
+        m = self._new_maze(width, height, CellType.WALL)
         row, col = m.random_position()
-        active = []
-        set_cell(m, (row, col), CellType.ROAD, symmetry, active)
+        active = ActiveCells(width * height)
+        m.set_value(row, col, ROAD)
+        active.add(row // 2 * width + col // 2)
 
         # continue until you have no more neighbors to move to
-        while active:
-            if random.random() < self.backtrack_chance:
-                row, col = active[-1]
-            else:
-                row, col = random.choice(active)
+        while len(active) > 0:
+            number = self.strategy.select(active, self.rng)
+            row, col = divmod(number, width)
+            row, col = row * 2 + 1, col * 2 + 1
 
             # find a visited neighbor
             next_neighbors = m.find_neighbors(row, col, is_wall=True)
             if len(next_neighbors) == 0:
-                active = [a for a in active if a != (row, col)]
+                active.remove(number)
                 continue
 
-            row_, col_ = random.choice(next_neighbors)
-            set_cell(m, (row_, col_), CellType.ROAD, symmetry, active)
-            set_cell(m, ((row + row_) // 2, (col + col_) // 2), CellType.ROAD, symmetry)
+            row_, col_ = self.rng.choice(next_neighbors)
+            m.set_value(row_, col_, ROAD)
+            m.set_value((row + row_) // 2, (col + col_) // 2, ROAD)
+            active.add(row_ // 2 * width + col_ // 2)
 
         return m
@@ -1,8 +1,9 @@
 import random
+import typing as tp
 
-from mmaze.generator.base import BaseMazeGenerator, set_cell
+from mmaze.generator.base import BaseMazeGenerator, CarvingKernel, IndexedSet
 from mmaze.maze import Maze
-from mmaze.cell import CellType
+from mmaze.cell import CellType, ROAD
 
 RANDOM = 1
 SERPENTINE = 2
@@ -13,19 +14,18 @@ class HuntAndKill(BaseMazeGenerator):
     1. Randomly choose a starting cell.
     2. Perform a random walk from the current cel, carving passages to unvisited neighbors,
         until the current cell has no unvisited neighbors.
-    3. Select a new grid cell; if it has been visited, walk from it.
-    4. Repeat steps 2 and 3 a sufficient number of times that there the probability of a cell
-        not being visited is extremely small.
-
-    In this implementation of Hunt-and-kill there are two different ways to select a new grid cell in step 2.  The first
-    is serpentine through the grid (the classic solution), the second is to randomly select a new cell enough times that
-    the probability of an unexplored cell is very, very low. The second option includes a small amount of risk, but it
-    creates a more interesting, harder maze.
+    3. Hunt for an unvisited cell next to a visited one, carve a passage between them and walk from it.
+    4. Repeat steps 2 and 3 until every cell has been visited.
+
+    In this implementation of Hunt-and-kill there are two different ways to select a new grid cell in step 3.  The first
+    is serpentine through the grid (the classic solution), the second is to randomly select one of the candidates, which
+    creates a more interesting, harder maze. Candidates are kept in a frontier index that is updated as cells are
+    visited, so no hunt rescans the grid.
     """
     symmetry_ok = True
 
-    def __init__(self, hunt_order="random"):
-        super().__init__()
+    def __init__(self, hunt_order="random", rng: tp.Optional[random.Random] = None):
+        super().__init__(rng=rng)
 
         # the user can define what order to hunt for the next cell in
         if hunt_order.lower().strip() == "serpentine":
@@ -33,98 +33,102 @@ class HuntAndKill(BaseMazeGenerator):
         else:
             self.ho = RANDOM
 
-    def _generate(self, width: int, height: int, symmetry: str = "none") -> Maze:
-        m = Maze(width, height, CellType.WALL)
+    def _generate(self, width: int, height: int, **kwargs) -> Maze:
+        m = self._new_maze(width, height, CellType.WALL)
+        # unvisited cells next to a visited one, by cell number row * width + col
+        frontier = IndexedSet(width * height)
+        self._cursor = 0
         # find an arbitrary starting position
         row, col = m.random_position()
-        set_cell(m, (row, col), CellType.ROAD, symmetry)
+        m.set_value(row, col, ROAD)
+        frontier.add(row // 2 * width + col // 2)
+        kernel = CarvingKernel(m)
+        i = row * m.width + col
 
-        # perform many random walks, to fill the maze
-        num_trials = 0
-        while (row, col) != (-1, -1):
-            self._walk(m, row, col, symmetry)
-            row, col = self._hunt(m, num_trials)
-            num_trials += 1
+        # walk, then hunt, until every cell is visited
+        while i >= 0:
+            self._walk(m, kernel, i, self._visit(m, kernel, i, frontier), frontier)
+            i = self._hunt(m, kernel, frontier)
 
         return m
 
-    def _walk(self, maze: Maze, row, col, symmetry):
+    @staticmethod
+    def _visit(maze: Maze, kernel: CarvingKernel, i: int, frontier: IndexedSet) -> tp.List[int]:
+        """Move the open cell i out of the frontier, and its unvisited neighbor cells into it.
+
+        Returns:
+            list: unvisited neighbor cells of i, by grid index
+        """
+        maze_width = maze.width
+        base_width = maze.base_width
+        r, c = divmod(i, maze_width)
+        frontier.remove(r // 2 * base_width + c // 2)
+        neighbors = kernel.unvisited(i)
+        for j in neighbors:
+            r, c = divmod(j, maze_width)
+            frontier.add(r // 2 * base_width + c // 2)
+        return neighbors
+
+    def _walk(self, maze: Maze, kernel: CarvingKernel, i: int, neighbors: tp.List[int], frontier: IndexedSet):
         """This is a standard random walk. It must start from a visited cell.
         And it completes when the current cell has no unvisited neighbors.
 
         Args:
-            row (int): row index
-            col (int): col index
+            kernel (CarvingKernel): carving kernel of the maze
+            i (int): grid index of the cell to start from
+            neighbors (list): unvisited neighbor cells of i
+            frontier (IndexedSet): unvisited cells next to a visited one
         Returns: None
         """
-        if maze.get(row, col) == CellType.ROAD:
-            this_row = row
-            this_col = col
-            unvisited_neighbors = maze.find_neighbors(this_row, this_col, True)
-
-            while len(unvisited_neighbors) > 0:
-                neighbor = random.choice(unvisited_neighbors)
-                set_cell(maze, (neighbor[0], neighbor[1]), CellType.ROAD, symmetry)
-                set_cell(
-                    maze,
-                    ((neighbor[0] + this_row) // 2, (neighbor[1] + this_col) // 2),
-                    CellType.ROAD,
-                    symmetry
-                )
-                this_row, this_col = neighbor
-                unvisited_neighbors = maze.find_neighbors(this_row, this_col, True)
-
-    def _hunt(self, maze: Maze, count):
-        """Based on how this algorithm was configured, choose hunt for the next starting point.
+        rng = self.rng
+        while neighbors:
+            j = neighbors[rng.randrange(len(neighbors))] if len(neighbors) > 1 else neighbors[0]
+            kernel.carve(i, j)
+            neighbors = self._visit(maze, kernel, j, frontier)
+            i = j
+
+    def _hunt(self, maze: Maze, kernel: CarvingKernel, frontier: IndexedSet) -> int:
+        """Based on how this algorithm was configured, hunt for the next starting point,
+        and connect it to a random visited neighbor.
 
         Args:
-            count (int): how long to iterate
+            kernel (CarvingKernel): carving kernel of the maze
+            frontier (IndexedSet): unvisited cells next to a visited one
         Returns:
-            tuple: position of next cell
+            int: grid index of the next cell, or -1 once every cell is visited
         """
+        if len(frontier) == 0:
+            return -1
+
         if self.ho == SERPENTINE:
-            return self._hunt_serpentine(maze, count)
+            number = self._hunt_serpentine(maze, frontier)
         else:
-            return self._hunt_random(maze.width, maze.height, count)
+            number = frontier.pick(self.rng)
+        row, col = divmod(number, maze.base_width)
+        row, col = row * 2 + 1, col * 2 + 1
 
-    @staticmethod
-    def _hunt_random(width, height, count):
-        """Select the next cell to walk from, randomly.
+        visited_row, visited_col = maze.find_neighbors(row, col, False)[0]
+        kernel.carve(visited_row * maze.width + visited_col, row * maze.width + col)
+        return row * maze.width + col
 
-        Args:
-            count (int): row index
-        Returns:
-            tuple: position of next cell
-        """
-        if count >= (height * width):
-            return -1, -1
-
-        return random.randrange(1, height, 2), random.randrange(1, width, 2)
-
-    @staticmethod
-    def _hunt_serpentine(maze: Maze, count):
+    def _hunt_serpentine(self, maze: Maze, frontier: IndexedSet) -> int:
         """Select the next cell to walk from by cycling through every grid cell in order.
+        The scan resumes where the previous hunt stopped, since cells never become unvisited again.
 
         Args:
-            count (int): how long to iterate
+            frontier (IndexedSet): unvisited cells next to a visited one
         Returns:
-            tuple: position of next cell
+            int: number of the next cell
         """
-        row, col = (1, 1)
-        found = False
-
-        while not found:
-            col = col + 2
-            if col > (maze.width - 2):
-                row += 2
-                col = 1
-                if row > (maze.height - 2):
-                    return -1, -1
-
-            if (
-                    maze.get(row, col) == CellType.ROAD
-                    and len(maze.find_neighbors(row, col, True)) > 0
-            ):
-                found = True
-
-        return row, col
+        grid = maze.grid
+        n = maze.base_width * maze.base_height
+        while self._cursor < n:
+            row, col = divmod(self._cursor, maze.base_width)
+            if grid[(row * 2 + 1) * maze.width + col * 2 + 1] != ROAD:
+                break
+            self._cursor += 1
+
+        if self._cursor in frontier:
+            return self._cursor
+        # the first unvisited cell has visited cells above and to its left, unless it is the top left cell
+        return frontier.items[0]
@@ -1,117 +1,62 @@
-import random
-import typing as tp
+from array import array
 
-from mmaze.generator.base import BaseMazeGenerator
+from mmaze.generator.base import BaseMazeGenerator, DisjointSet
 from mmaze.maze import Maze
-from mmaze.cell import CellType
+from mmaze.cell import CellType, ROAD
 
 
 class Kruskal(BaseMazeGenerator):
+    """
+    1. Put every cell in its own tree.
+    2. Visit the walls between cells in random order.
+    3. If the cells on both sides of a wall belong to different trees, remove the wall and join the trees.
+    4. Stop when a single tree is left.
+    """
     symmetry_ok = False
 
     def _generate(self, width: int, height: int, **kwargs) -> Maze:
-        m = Maze(width, height, CellType.WALL)
-        forest = []
+        m = self._new_maze(width, height, CellType.WALL)
         for row in range(1, m.height - 1, 2):
-            for col in range(1, m.width - 1, 2):
-                forest.append([(row, col)])
-                m.set(row, col, CellType.ROAD)
+            m.set_row(row, bytes([ROAD]) * width, col=1, step=2)
 
-        edges: tp.List[tp.Tuple[int, int]] = []
+        # walls between cells, as flat grid indices of 4 bytes
+        edges = array("I")
         for row in range(2, m.height - 1, 2):
-            for col in range(1, m.width - 1, 2):
-                edges.append((row, col))
+            edges.extend(range(row * m.width + 1, row * m.width + m.width - 1, 2))
         for row in range(1, m.height - 1, 2):
-            for col in range(2, m.width - 1, 2):
-                edges.append((row, col))
+            edges.extend(range(row * m.width + 2, row * m.width + m.width - 1, 2))
 
-        random.shuffle(edges)
+        self.rng.shuffle(edges)
 
-        while len(forest) > 1:
-            ce_row, ce_col = edges[0]
-            edges = edges[1:]
-
-            tree1 = -1
-            tree2 = -1
-
-            if ce_row % 2 == 0:  # even-numbered row: vertical wall
-                tree1 = sum(
-                    [
-                        i if (ce_row - 1, ce_col) in j else 0
-                        for i, j in enumerate(forest)
-                    ]
-                )
-                tree2 = sum(
-                    [
-                        i if (ce_row + 1, ce_col) in j else 0
-                        for i, j in enumerate(forest)
-                    ]
-                )
-            else:  # odd-numbered row: horizontal wall
-                tree1 = sum(
-                    [
-                        i if (ce_row, ce_col - 1) in j else 0
-                        for i, j in enumerate(forest)
-                    ]
-                )
-                tree2 = sum(
-                    [
-                        i if (ce_row, ce_col + 1) in j else 0
-                        for i, j in enumerate(forest)
-                    ]
-                )
-
-            if tree1 != tree2:
-                new_tree = forest[tree1] + forest[tree2]
-                temp1 = list(forest[tree1])
-                temp2 = list(forest[tree2])
-                forest = [
-                    x for x in forest if x != temp1
-                ]  # faster than forest.remove(temp1)
-                forest = [x for x in forest if x != temp2]
-                forest.append(new_tree)
-                m.set(ce_row, ce_col, CellType.ROAD)
+        forest = DisjointSet(width * height)
+        for i in range(len(edges)):
+            if forest.count <= 1:
+                break
+            ce_row, ce_col = divmod(edges[i], m.width)
+            self._step(ce_row, ce_col, forest, m)
 
         return m
 
     @staticmethod
-    def _step(ce_row, ce_col, forest, m):
+    def _step(ce_row, ce_col, forest: DisjointSet, m: Maze) -> bool:
+        """Remove the wall at (ce_row, ce_col) if it separates two different trees.
+
+        Args:
+            ce_row (int): row of the wall
+            ce_col (int): col of the wall
+            forest (DisjointSet): trees of the cells, indexed by cell number
+            m (Maze): maze
+        Returns:
+            bool: whether the wall was removed
+        """
         if ce_row % 2 == 0:  # even-numbered row: vertical wall
-            tree1 = sum(
-                [
-                    i if (ce_row - 1, ce_col) in j else 0
-                    for i, j in enumerate(forest)
-                ]
-            )
-            tree2 = sum(
-                [
-                    i if (ce_row + 1, ce_col) in j else 0
-                    for i, j in enumerate(forest)
-                ]
-            )
+            tree1 = (ce_row // 2 - 1) * m.base_width + ce_col // 2
+            tree2 = tree1 + m.base_width
         else:  # odd-numbered row: horizontal wall
-            tree1 = sum(
-                [
-                    i if (ce_row, ce_col - 1) in j else 0
-                    for i, j in enumerate(forest)
-                ]
-            )
-            tree2 = sum(
-                [
-                    i if (ce_row, ce_col + 1) in j else 0
-                    for i, j in enumerate(forest)
-                ]
-            )
+            tree1 = ce_row // 2 * m.base_width + ce_col // 2 - 1
+            tree2 = tree1 + 1
 
-        if tree1 != tree2:
-            new_tree = forest[tree1] + forest[tree2]
-            temp1 = list(forest[tree1])
-            temp2 = list(forest[tree2])
-            forest = [
-                x for x in forest if x != temp1
-            ]  # faster than forest.remove(temp1)
-            forest = [x for x in forest if x != temp2]
-            forest.append(new_tree)
-            m.set(ce_row, ce_col, CellType.ROAD)
+        if forest.union(tree1, tree2):
+            m.set_value(ce_row, ce_col, ROAD)
             return True
         return False
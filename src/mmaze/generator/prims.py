@@ -1,8 +1,6 @@
-import random
-
-from mmaze.generator.base import BaseMazeGenerator, set_cell
+from mmaze.generator.base import BaseMazeGenerator, IndexedSet, carve_cell
 from mmaze.maze import Maze
-from mmaze.cell import CellType
+from mmaze.cell import CellType, ROAD
 
 
 class Prims(BaseMazeGenerator):
@@ -15,31 +13,37 @@ class Prims(BaseMazeGenerator):
         V with another cell not in V.
     3. Add that wall to the Minimal Spanning Tree (MST), and the edge's other cell to V.
     4. Repeat steps 2 and 3 until V includes every cell in G.
+
+    The cells not in V next to a cell in V are kept in a frontier set with O(1) random removal.
     """
     symmetry_ok = True
 
-    def _generate(self, width: int, height: int, symmetry: str = "none") -> Maze:
-        m = Maze(width, height, CellType.WALL)
+    def _generate(self, width: int, height: int, **kwargs) -> Maze:
+        m = self._new_maze(width, height, CellType.WALL)
+        grid = m.grid
+        maze_width = m.width
+        # unvisited cells next to a visited one, by cell number row * width + col
+        frontier = IndexedSet(width * height)
         # choose a random starting position
-        row, col = m.random_position()
-        set_cell(m, (row, col), CellType.ROAD, symmetry)
-
-        # created a weighted list of all vertices connected in the graph
-        neighbors = m.find_neighbors(row, col, True)
-
-        while len(neighbors) >= 1:
-            # find neighbor with lowest weight, make it current
-            nn = random.randrange(len(neighbors))
-            row, col = neighbors[nn]
-            set_cell(m, (row, col), CellType.ROAD, symmetry)
-
-            neighbors = neighbors[:nn] + neighbors[nn + 1:]
-            # connect that neighbor to a random neighbor with grid[posi] == 0
-            nearest_n0, nearest_n1 = m.find_neighbors(row, col)[0]
-            set_cell(m, ((row + nearest_n0) // 2, (col + nearest_n1) // 2), CellType.ROAD, symmetry)
-
-            # find all unvisited neighbors of current, add them to neighbors
-            unvisited = m.find_neighbors(row, col, True)
-            neighbors = list(set(neighbors + unvisited))
+        carve_cell(m, m.random_position(), frontier)
+
+        while len(frontier) > 0:
+            # pick a random frontier cell
+            row, col = divmod(frontier.pick(self.rng), width)
+            row, col = row * 2 + 1, col * 2 + 1
+
+            # connect it to a random visited neighbor
+            i = row * maze_width + col
+            visited = []
+            if row > 1 and grid[i - 2 * maze_width] == ROAD:
+                visited.append((row - 1, col))
+            if row < m.height - 2 and grid[i + 2 * maze_width] == ROAD:
+                visited.append((row + 1, col))
+            if col > 1 and grid[i - 2] == ROAD:
+                visited.append((row, col - 1))
+            if col < maze_width - 2 and grid[i + 2] == ROAD:
+                visited.append((row, col + 1))
+            carve_cell(m, (row, col), frontier)
+            m.set_value(*self.rng.choice(visited), ROAD)
 
         return m
@@ -1,12 +1,18 @@
 import random
+import typing as tp
 
-from mmaze.generator.base import BaseMazeGenerator
+from mmaze.generator.base import BaseMazeGenerator, IndexedSet
 from mmaze.maze import Maze
-from mmaze.cell import CellType
+from mmaze.cell import CellType, ROAD, WALL
 
 RANDOM = 1
 SERPENTINE = 2
 
+# random walk directions: north, south, west, east
+NORTH, SOUTH, WEST, EAST = range(4)
+# number of random directions drawn from the rng at a time
+_BULK = 4096
+
 
 class Wilsons(BaseMazeGenerator):
     """The Algorithm
@@ -15,11 +21,14 @@ class Wilsons(BaseMazeGenerator):
     2. Select any cell that is not in the UST and perform a random walk until you find a cell that is.
     3. Add the cells and walls visited in the random walk to the UST.
     4. Repeat steps 2 and 3 until all cells have been added to the UST.
+
+    The walk records its last exit direction from each cell in a byte array over the cells, so walking over a cell
+    again overwrites it and erases the loop; carving replays the directions from the start cell.
     """
     symmetry_ok = False
 
-    def __init__(self, hunt_order="random"):
-        super().__init__()
+    def __init__(self, hunt_order="random", rng: tp.Optional[random.Random] = None):
+        super().__init__(rng=rng)
 
         # the user can define what order to hunt for the next cell in
         if hunt_order.lower().strip() == "serpentine":
@@ -28,156 +37,157 @@ class Wilsons(BaseMazeGenerator):
             self._hunt_order = RANDOM
 
     def _generate(self, width: int, height: int, **kwargs) -> Maze:
-        m = Maze(width, height, CellType.WALL)
+        m = self._new_maze(width, height, CellType.WALL)
+        # cells not yet in the UST, by cell number row * width + col
+        unvisited = IndexedSet(width * height, full=True)
+        self._cursor = 0
         # find an arbitrary starting position
         row, col = m.random_position()
-        m.set(row, col, CellType.ROAD)
-        num_visited = 1
-        row, col = self._hunt(m, num_visited)
+        m.set_value(row, col, ROAD)
+        unvisited.remove(self._cell_number(m, row, col))
+        row, col = self._hunt(m, unvisited)
 
         # perform many random walks, to fill the maze
+        directions = bytearray(width * height)
+        self._random_directions = b""
+        self._random_position = 0
         while row != -1 and col != -1:
-            walk = self._generate_random_walk(m, (row, col))
-            num_visited += self._solve_random_walk(m, walk, (row, col))
-            row, col = self._hunt(m, num_visited)
+            self._generate_random_walk(m, (row, col), directions)
+            self._solve_random_walk(m, directions, (row, col), unvisited)
+            row, col = self._hunt(m, unvisited)
 
         return m
 
-    def _hunt(self, maze: Maze, count):
+    @staticmethod
+    def _cell_number(maze: Maze, row: int, col: int) -> int:
+        return row // 2 * maze.base_width + col // 2
+
+    @staticmethod
+    def _cell_position(maze: Maze, number: int) -> tp.Tuple[int, int]:
+        row, col = divmod(number, maze.base_width)
+        return row * 2 + 1, col * 2 + 1
+
+    def _hunt(self, maze: Maze, unvisited: IndexedSet):
         """Based on how this algorithm was configured, choose hunt for the next starting point.
 
         Args:
-            count (int): max number of times to iterate
+            unvisited (IndexedSet): cells not in the UST yet
         Returns:
             tuple: next cell
         """
         if self._hunt_order == SERPENTINE:
-            return self._hunt_serpentine(maze, count)
+            return self._hunt_serpentine(maze, unvisited)
         else:
-            return self._hunt_random(maze, count)
+            return self._hunt_random(maze, unvisited)
 
-    @staticmethod
-    def _hunt_random(maze: Maze, count):
-        """Select the next cell to walk from, randomly.
+    def _hunt_random(self, maze: Maze, unvisited: IndexedSet):
+        """Select the next cell to walk from, randomly among the cells not in the UST.
 
         Args:
-            count (int): max number of times to iterate
+            unvisited (IndexedSet): cells not in the UST yet
         Returns:
             tuple: next cell
         """
-        if count >= maze.base_width * maze.base_height:
+        if len(unvisited) == 0:
             return -1, -1
 
-        return maze.random_position()
+        return self._cell_position(maze, unvisited.pick(self.rng))
 
-    @staticmethod
-    def _hunt_serpentine(maze: Maze, count):
+    def _hunt_serpentine(self, maze: Maze, unvisited: IndexedSet):
         """Select the next cell to walk from by cycling through every grid cell in order.
+        The scan resumes where the previous hunt stopped, since cells never leave the UST.
 
         Args:
-            count (int): max number of times to iterate
+            unvisited (IndexedSet): cells not in the UST yet
         Returns:
             tuple: next cell
         """
-        cell = (1, -1)
-        found = False
-
-        while not found:
-            cell = (cell[0], cell[1] + 2)
-            if cell[1] > maze.width - 2:
-                cell = (cell[0] + 2, 1)
-                if cell[0] > maze.height - 2:
-                    return -1, -1
-
-            if maze.get(cell[0], cell[1]) != CellType.ROAD:
-                found = True
+        n = maze.base_width * maze.base_height
+        while self._cursor < n and self._cursor not in unvisited:
+            self._cursor += 1
+        if self._cursor == n:
+            return -1, -1
 
-        return cell
+        return self._cell_position(maze, self._cursor)
 
-    def _generate_random_walk(self, maze: Maze, start):
+    def _generate_random_walk(self, maze: Maze, start, directions: bytearray):
         """From a given starting position, walk randomly until you hit a visited cell.
 
-        The returned walk object is a dictionary mapping your location (cell) to a
-        direction. If you randomly walk over the same cell twice, you overwrite
-        the direction at that location.
+        The walk is recorded in ``directions``, which maps each cell number to the direction
+        of the walk's last exit from that cell. If you randomly walk over the same cell twice,
+        you overwrite the direction at that location.
 
         Args:
             maze (Maze): maze array
             start (tuple): position to start from
-        Returns:
-            dict: map of your location to the direction you want to travel
+            directions (bytearray): last exit direction, per cell number
+        Returns: None
         """
-        direction = self._random_dir(maze.width, maze.height, start)
-        walk = {start: direction}
-        current = self._move(start, direction)
-
-        while maze.get(current[0], current[1]) == CellType.WALL:
-            direction = self._random_dir(maze.width, maze.height, current)
-            walk[current] = direction
-            current = self._move(current, direction)
-
-        return walk
-
-    @staticmethod
-    def _random_dir(width, height, current):
-        """Take a step on one random (but valid) direction
-
-        Args:
-            current (tuple): cell to start from
-        Returns:
-            tuple: random, valid direction to travel to
-        """
-        r, c = current
-        options = []
-        if r > 1:
-            options.append(0)  # North
-        if r < (height - 2):
-            options.append(1)  # South
-        if c > 1:
-            options.append(2)  # East
-        if c < (width - 2):
-            options.append(3)  # West
-
-        direction = random.choice(options)
-        if direction == 0:
-            return -2, 0  # North
-        elif direction == 1:
-            return 2, 0  # South
-        elif direction == 2:
-            return 0, -2  # East
-        else:
-            return 0, 2  # West
-
-    @staticmethod
-    def _move(start, direction):
-        """Convolve a position tuple with a direction tuple to generate a new position.
-
-        Args:
-            start (tuple): position to start from
-            direction (tuple): vector direction to travel to
-        Returns:
-            tuple: position of next cell to travel to
-        """
-        return start[0] + direction[0], start[1] + direction[1]
-
-    def _solve_random_walk(self, maze: Maze, walk, start):
+        base_width = maze.base_width
+        base_height = maze.base_height
+        grid = maze.grid
+        cell_steps = (-base_width, base_width, -1, 1)
+        grid_steps = (-2 * maze.width, 2 * maze.width, -2, 2)
+
+        row, col = start[0] // 2, start[1] // 2
+        k = row * base_width + col
+        i = start[0] * maze.width + start[1]
+        pool = self._random_directions
+        p = self._random_position
+        while grid[i] == WALL:
+            if p == len(pool):
+                pool = self.rng.getrandbits(8 * _BULK).to_bytes(_BULK, "little")
+                p = 0
+            d = pool[p] & 3
+            p += 1
+            # redraw directions that leave the maze, the valid ones stay equally likely
+            if d == NORTH:
+                if row == 0:
+                    continue
+                row -= 1
+            elif d == SOUTH:
+                if row == base_height - 1:
+                    continue
+                row += 1
+            elif d == WEST:
+                if col == 0:
+                    continue
+                col -= 1
+            else:
+                if col == base_width - 1:
+                    continue
+                col += 1
+            directions[k] = d
+            k += cell_steps[d]
+            i += grid_steps[d]
+        self._random_directions = pool
+        self._random_position = p
+
+    def _solve_random_walk(self, maze: Maze, directions: bytearray, start, unvisited: IndexedSet):
         """Move through the random walk, visiting all the cells you touch,
         and breaking down the walls you cross.
 
         Args:
-            walk (dict): random walk directions, from each cell
+            directions (bytearray): last exit direction of the random walk, per cell number
             start (tuple): position of cell to star the process at
+            unvisited (IndexedSet): cells not in the UST yet
         Returns:
             int: number of steps taken to complete the process
         """
+        grid = maze.grid
+        cell_steps = (-maze.base_width, maze.base_width, -1, 1)
+        wall_steps = (-maze.width, maze.width, -1, 1)
+        k = self._cell_number(maze, start[0], start[1])
+        i = start[0] * maze.width + start[1]
         visits = 0
-        current = start
 
-        while maze.get(current[0], current[1]) != CellType.ROAD:
-            maze.set(current[0], current[1], CellType.ROAD)
-            next1 = self._move(current, walk[current])
-            maze.set((next1[0] + current[0]) // 2, (next1[1] + current[1]) // 2, CellType.ROAD)
+        while grid[i] != ROAD:
+            grid[i] = ROAD
+            unvisited.remove(k)
+            d = directions[k]
+            grid[i + wall_steps[d]] = ROAD
+            k += cell_steps[d]
+            i += 2 * wall_steps[d]
             visits += 1
-            current = next1
 
         return visits
@@ -1,26 +1,226 @@
+import mmap
 import random
+import struct
 import typing as tp
 
 import mmaze
 from mmaze import visual
-from mmaze.cell import CellType
+from mmaze.cell import CellType, CELL_TYPES, ROAD, WALL
+from mmaze.distance import DistanceField, TreePathIndex
+
+STORAGES = ("bytearray", "numpy", "mmap")
+
+# header of the on-disk layout: magic, base width, base height; the grid bytes follow
+_HEADER = struct.Struct("<4sII")
+_MAGIC = b"MMZ1"
+_FILL_CHUNK = 1 << 20
+# distance fields kept per maze, the least recently computed ones are dropped
+_MAX_FIELDS = 8
+
+
+def _new_grid(storage: str, size: int, value: int):
+    """Allocate a flat, one-byte-per-cell grid.
+
+    Args:
+        storage (str): one of "bytearray" or "numpy"
+        size (int): number of cells
+        value (int): initial cell code
+    Returns:
+        the grid buffer
+    """
+    if storage == "bytearray":
+        return bytearray([value]) * size
+    if storage == "numpy":
+        try:
+            import numpy as np
+        except ModuleNotFoundError as e:
+            raise ValueError(f"storage of 'numpy' requires numpy to be installed: {e}")
+        return np.full(size, value, dtype=np.uint8)
+    raise ValueError(f"storage must be one of {list(STORAGES)}, but got {storage}")
+
+
+def _map_file(path: str, base_width: int, base_height: int, size: int, value: int) -> mmap.mmap:
+    """Create a maze file of the on-disk layout and map it into memory.
+
+    Args:
+        path (str): file to create, overwritten if it exists
+        base_width (int): maze width in cells
+        base_height (int): maze height in cells
+        size (int): number of grid cells
+        value (int): initial cell code
+    Returns:
+        mmap.mmap: writable mapping of the whole file
+    """
+    with open(path, "w+b") as f:
+        f.truncate(_HEADER.size + size)
+        mm = mmap.mmap(f.fileno(), _HEADER.size + size)
+    mm[:_HEADER.size] = _HEADER.pack(_MAGIC, base_width, base_height)
+    if value != 0:
+        # a truncated file is zero filled already, only other codes need writing
+        chunk = bytes([value]) * _FILL_CHUNK
+        for start in range(_HEADER.size, _HEADER.size + size, _FILL_CHUNK):
+            stop = min(start + _FILL_CHUNK, _HEADER.size + size)
+            mm[start:stop] = chunk[:stop - start]
+    return mm
+
+
+class _RowView:
+    """A single row of the maze, reading and writing CellType members."""
+    __slots__ = ("_maze", "_row")
+
+    def __init__(self, maze: "Maze", row: int):
+        self._maze = maze
+        self._row = row
+
+    def __len__(self):
+        return self._maze.width
+
+    def __getitem__(self, col):
+        if isinstance(col, slice):
+            return [CELL_TYPES[v] for v in self._maze.get_row(self._row)[col]]
+        return self._maze.get(self._row, col)
+
+    def __setitem__(self, col: int, cell_type: CellType):
+        self._maze.set(self._row, col, cell_type)
+
+    def __iter__(self):
+        return (CELL_TYPES[v] for v in self._maze.get_row(self._row))
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+
+class _RowsView:
+    """List-of-rows view over the flat grid, kept for the original ``Maze.data`` API."""
+    __slots__ = ("_maze",)
+
+    def __init__(self, maze: "Maze"):
+        self._maze = maze
+
+    def __len__(self):
+        return self._maze.height
+
+    def __getitem__(self, row):
+        if isinstance(row, slice):
+            return [_RowView(self._maze, r) for r in range(self._maze.height)[row]]
+        if row < 0:
+            row += self._maze.height
+        if not 0 <= row < self._maze.height:
+            raise IndexError("row index out of range")
+        return _RowView(self._maze, row)
+
+    def __setitem__(self, row: int, cells: tp.Sequence[CellType]):
+        if row < 0:
+            row += self._maze.height
+        self._maze.set_row(row, bytes(c.value for c in cells))
+
+    def __iter__(self):
+        return (_RowView(self._maze, r) for r in range(self._maze.height))
 
 
 class Maze:
-    def __init__(self, width, height, cell_type: CellType = CellType.WALL):
+    def __init__(
+            self,
+            width,
+            height,
+            cell_type: CellType = CellType.WALL,
+            storage: str = "bytearray",
+            path: tp.Optional[str] = None,
+            rng: tp.Optional[random.Random] = None,
+    ):
         self._base_width = width
         self._base_height = height
         self._width = width * 2 + 1
         self._height = height * 2 + 1
-        self.data: tp.List[tp.List[CellType]] = [[cell_type] * self._width for _ in range(self._height)]
+        self.storage = storage
+        self.rng = rng if rng is not None else random.Random()
+        self._mmap = None
+        # row-major grid holding one integer code per cell
+        if storage == "mmap":
+            if path is None:
+                raise ValueError("storage of 'mmap' requires a file path")
+            self._mmap = _map_file(path, width, height, self._width * self._height, cell_type.value)
+            self.grid = memoryview(self._mmap)[_HEADER.size:]
+        else:
+            self.grid = _new_grid(storage, self._width * self._height, cell_type.value)
         self.solutions = []
+        # structures derived from the grid, dropped whenever it is written through the methods below
+        self._cache = {}
+
+    @classmethod
+    def open(cls, path: str, writable: bool = False) -> "Maze":
+        """Map a maze file written with storage="mmap" back into memory, without parsing it.
+
+        Args:
+            path (str): maze file
+            writable (bool): map the file for writing, read-only by default
+        Returns:
+            Maze: maze whose grid is backed by the file
+        """
+        with open(path, "r+b" if writable else "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ)
+        magic, base_width, base_height = _HEADER.unpack(mm[:_HEADER.size])
+        if magic != _MAGIC or len(mm) != _HEADER.size + (base_width * 2 + 1) * (base_height * 2 + 1):
+            mm.close()
+            raise ValueError(f"'{path}' is not a maze file")
+        return cls._from_grid(base_width, base_height, memoryview(mm)[_HEADER.size:], "mmap", mm)
+
+    def tobytes(self) -> bytes:
+        """Serialize the maze to the same layout as a maze file: a small header, then the grid."""
+        return _HEADER.pack(_MAGIC, self._base_width, self._base_height) + bytes(self.grid)
+
+    @classmethod
+    def frombytes(cls, data: bytes) -> "Maze":
+        """Rebuild a maze from the output of ``tobytes``."""
+        magic, base_width, base_height = _HEADER.unpack(data[:_HEADER.size])
+        if magic != _MAGIC or len(data) != _HEADER.size + (base_width * 2 + 1) * (base_height * 2 + 1):
+            raise ValueError("data is not a serialized maze")
+        return cls._from_grid(base_width, base_height, bytearray(data[_HEADER.size:]), "bytearray")
+
+    @classmethod
+    def _from_grid(cls, base_width: int, base_height: int, grid, storage: str, mm=None) -> "Maze":
+        m = cls.__new__(cls)
+        m._base_width = base_width
+        m._base_height = base_height
+        m._width = base_width * 2 + 1
+        m._height = base_height * 2 + 1
+        m.storage = storage
+        m.rng = random.Random()
+        m._mmap = mm
+        m.grid = grid
+        m.solutions = []
+        m._cache = {}
+        return m
+
+    def flush(self):
+        """Write the changes of a file backed maze to disk."""
+        if self._mmap is not None:
+            self._mmap.flush()
+
+    def close(self):
+        """Release the file mapping of a file backed maze."""
+        if self._mmap is not None:
+            self.grid.release()
+            self._mmap.close()
+            self._mmap = None
+            self.grid = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def data(self) -> _RowsView:
+        return _RowsView(self)
 
     def check_wall(self, row, col, is_wall):
-        cell = self.get(row, col)
+        cell = self.grid[row * self._width + col]
         if is_wall:
-            return cell == CellType.WALL
+            return cell == WALL
         else:
-            return cell != CellType.WALL
+            return cell != WALL
 
     def find_neighbors(self, r: int, c: int, is_wall: bool = False) -> tp.List[tp.Tuple[int, int]]:
         """Find all the grid neighbors of the current position; visited, or not.
@@ -34,27 +234,86 @@ class Maze:
         """
 
         ns = []
+        grid = self.grid
+        w = self._width
+        i = r * w + c
 
-        if r > 1 and self.check_wall(r - 2, c, is_wall):
+        if r > 1 and (grid[i - 2 * w] == WALL) == is_wall:
             ns.append((r - 2, c))
-        if r < self.height - 2 and self.check_wall(r + 2, c, is_wall):
+        if r < self._height - 2 and (grid[i + 2 * w] == WALL) == is_wall:
             ns.append((r + 2, c))
-        if c > 1 and self.check_wall(r, c - 2, is_wall):
+        if c > 1 and (grid[i - 2] == WALL) == is_wall:
             ns.append((r, c - 2))
-        if c < self.width - 2 and self.check_wall(r, c + 2, is_wall):
+        if c < w - 2 and (grid[i + 2] == WALL) == is_wall:
             ns.append((r, c + 2))
 
-        random.shuffle(ns)
+        self.rng.shuffle(ns)
         return ns
 
     def random_position(self):
-        return random.randrange(1, self._height, 2), random.randrange(1, self._width, 2)
+        return self.rng.randrange(1, self._height, 2), self.rng.randrange(1, self._width, 2)
+
+    def _index(self, row: int, col: int) -> int:
+        if row < 0:
+            row += self._height
+        if col < 0:
+            col += self._width
+        return row * self._width + col
 
     def set(self, row: int, col: int, cell_type: CellType):
-        self.data[row][col] = cell_type
+        if self._cache:
+            self._cache.clear()
+        self.grid[self._index(row, col)] = cell_type.value
 
     def get(self, row: int, col: int) -> CellType:
-        return self.data[row][col]
+        return CELL_TYPES[self.grid[self._index(row, col)]]
+
+    def set_value(self, row: int, col: int, value: int):
+        """Write an integer cell code, without the index normalisation of ``set``."""
+        if self._cache:
+            self._cache.clear()
+        self.grid[row * self._width + col] = value
+
+    def get_value(self, row: int, col: int) -> int:
+        """Read an integer cell code, without the index normalisation of ``get``."""
+        return self.grid[row * self._width + col]
+
+    def get_row(self, row: int) -> bytes:
+        start = row * self._width
+        return bytes(self.grid[start:start + self._width])
+
+    def set_row(self, row: int, values: bytes, col: int = 0, step: int = 1):
+        """Write a run of integer cell codes along a row.
+
+        Args:
+            row (int): row index
+            values (bytes): cell codes to write
+            col (int): first column to write
+            step (int): column stride between written cells
+        """
+        self._assign(row * self._width + col, step, values)
+
+    def set_col(self, col: int, values: bytes, row: int = 0, step: int = 1):
+        """Write a run of integer cell codes down a column.
+
+        Args:
+            col (int): column index
+            values (bytes): cell codes to write
+            row (int): first row to write
+            step (int): row stride between written cells
+        """
+        self._assign(row * self._width + col, step * self._width, values)
+
+    def _assign(self, start: int, step: int, values: bytes):
+        if len(values) == 0:
+            return
+        if self._cache:
+            self._cache.clear()
+        stop = start + (len(values) - 1) * step + 1
+        if self.storage == "numpy":
+            import numpy as np
+            values = np.frombuffer(bytes(values), dtype=np.uint8)
+        self.grid[start:stop:step] = values
 
     def plot(
             self,
@@ -79,9 +338,58 @@ class Maze:
             end: tp.Sequence[int],
             method: str = "backtracking"
     ) -> tp.Sequence:
-        self.solutions = mmaze.solve(self, start, end, method)
+        """Solve the maze with a solver. With "shortestpath", the path is read off a cached distance field
+        toward end, or from start, when ``distance_field`` computed one."""
+        fields = self._cache.get("distance", {}) if method.lower() == "shortestpath" else {}
+        if (end[0], end[1]) in fields:
+            self.solutions = fields[(end[0], end[1])].solutions(start)
+        elif (start[0], start[1]) in fields:
+            self.solutions = [s[::-1] for s in fields[(start[0], start[1])].solutions(end)]
+        else:
+            self.solutions = mmaze.solve(self, start, end, method)
         return self.solutions
 
+    def tree_index(self) -> TreePathIndex:
+        """Index answering the distance and the path between any two cells of a perfect maze without searching.
+        It is cached on the maze until the grid is written through ``set``, ``set_value``, ``set_row`` or ``set_col``,
+        and so is the finding that the maze is not perfect.
+
+        Returns:
+            TreePathIndex: path index of the maze
+        Raises:
+            ValueError: when the maze is not perfect
+        """
+        index = self._cache.get("tree")
+        if index is None:
+            try:
+                index = TreePathIndex(self)
+            except ValueError as e:
+                index = e
+            self._cache["tree"] = index
+        if isinstance(index, ValueError):
+            raise ValueError(*index.args)
+        return index
+
+    def distance_field(self, target: tp.Sequence[int]) -> DistanceField:
+        """Breadth first distances to target from every cell, with the next step of a shortest path.
+        The field is cached on the maze until the grid is written through ``set``, ``set_value``,
+        ``set_row`` or ``set_col``, and ``solve`` with "shortestpath" toward target reads it.
+
+        Args:
+            target (tuple): target cell, in cell coordinates
+        Returns:
+            DistanceField: distances and next steps toward target
+        """
+        fields = self._cache.setdefault("distance", {})
+        key = (target[0], target[1])
+        field = fields.get(key)
+        if field is None:
+            field = DistanceField(self, key)
+            fields[key] = field
+            if len(fields) > _MAX_FIELDS:
+                del fields[next(iter(fields))]
+        return field
+
     @property
     def height(self):
         return self._height
@@ -104,14 +412,9 @@ class Maze:
             end: tp.Optional[tp.Sequence[int]] = None,
             solution: tp.Optional[tp.Sequence[tp.Sequence]] = None,
     ) -> tp.List[tp.List[int]]:
-        if self.data is None:
+        if self.grid is None:
             return []
-        res = []
-        for row in self.data:
-            res_row = []
-            for cell in row:
-                res_row.append(cell.value)
-            res.append(res_row)
+        res = [list(self.get_row(r)) for r in range(self._height)]
         if start is not None:
             p = [p * 2 + 1 for p in start]
             res[p[0]][p[1]] = CellType.START.value
@@ -129,19 +432,14 @@ class Maze:
             end: tp.Optional[tp.Sequence[int]] = None,
             solution: tp.Optional[tp.Sequence[tp.Sequence]] = None,
     ):
-        if self.data is None:
+        if self.grid is None:
             return ""
 
         # build the walls of the grid
+        symbols = {WALL: "||", ROAD: "  "}
         txt = []
-        for row in self.data:
-            str_row = []
-            for cell in row:
-                if cell == CellType.WALL:
-                    str_row.append("||")
-                elif cell == CellType.ROAD:
-                    str_row.append("  ")
-            txt.append(str_row)
+        for r in range(self._height):
+            txt.append([symbols[cell] for cell in self.get_row(r) if cell in symbols])
 
         if solution is not None:
             for _, p in enumerate(solution):
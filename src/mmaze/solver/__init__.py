@@ -1,2 +1,3 @@
 from mmaze.solver.backtracking import Backtracking
 from mmaze.solver.shortest_path import ShortestPath
+from mmaze.solver.depth_first import DepthFirst
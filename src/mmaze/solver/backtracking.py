@@ -1,5 +1,3 @@
-import random
-
 from mmaze.solver.base import BaseSolver
 
 
@@ -31,7 +29,7 @@ class Backtracking(BaseSolver):
                 if solution[-3] in ns:
                     ns.remove(solution[-3])
 
-            nxt = random.choice(ns)
+            nxt = self.rng.choice(ns)
             solution.append(self._midpoint(solution[-1], nxt))
             solution.append(nxt)
 
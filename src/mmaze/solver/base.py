@@ -3,11 +3,12 @@ import typing as tp
 from abc import ABCMeta, abstractmethod
 
 from mmaze.maze import Maze
-from mmaze.cell import CellType
+from mmaze.cell import WALL
 
 
 class BaseSolver(metaclass=ABCMeta):
-    def __init__(self, prune=True):
+    def __init__(self, prune=True, rng: tp.Optional[random.Random] = None):
+        self.rng = rng if rng is not None else random.Random()
         self.maze = None
         self.start = None
         self.end = None
@@ -67,24 +68,24 @@ class BaseSolver(metaclass=ABCMeta):
         r, c = pos
         ns = []
 
-        if r > 1 and self.maze.get(r - 1, c) != CellType.WALL and self.maze.get(r - 2, c) != CellType.WALL:
+        if r > 1 and self.maze.get_value(r - 1, c) != WALL and self.maze.get_value(r - 2, c) != WALL:
             ns.append((r - 2, c))
         if (
                 r < self.maze.height - 2
-                and self.maze.get(r + 1, c) != CellType.WALL
-                and self.maze.get(r + 2, c) != CellType.WALL
+                and self.maze.get_value(r + 1, c) != WALL
+                and self.maze.get_value(r + 2, c) != WALL
         ):
             ns.append((r + 2, c))
-        if c > 1 and self.maze.get(r, c - 1) != CellType.WALL and self.maze.get(r, c - 2) != CellType.WALL:
+        if c > 1 and self.maze.get_value(r, c - 1) != WALL and self.maze.get_value(r, c - 2) != WALL:
             ns.append((r, c - 2))
         if (
                 c < self.maze.width - 2
-                and self.maze.get(r, c + 1) != CellType.WALL
-                and self.maze.get(r, c + 2) != CellType.WALL
+                and self.maze.get_value(r, c + 1) != WALL
+                and self.maze.get_value(r, c + 2) != WALL
         ):
             ns.append((r, c + 2))
 
-        random.shuffle(ns)
+        self.rng.shuffle(ns)
         return ns
 
     def _midpoint(self, a, b):
@@ -177,28 +178,27 @@ class BaseSolver(metaclass=ABCMeta):
         Returns:
             list: cleaner, tightened up solution to the maze
         """
-        found = True
-        attempt = 0
-        max_attempt = len(solution)
-
-        while found and len(solution) > 2 and attempt < max_attempt:
-            found = False
-            attempt += 1
-            first_i = 0
-            last_i = 0
-
-            for i in range(len(solution) - 1):
-                first = solution[i]
-                if first in solution[i + 1:]:
-                    first_i = i
-                    last_i = solution[i + 1:].index(first) + i + 1
-                    found = True
-                    break
-
-            if found:
-                solution = solution[:first_i] + solution[last_i:]
-
-        # solution does not include entrances
+        # erase loops in a single pass: when a cell shows up again, drop everything walked since it
+        path = []
+        last_seen = {}
+        for cell in solution:
+            i = last_seen.get(cell)
+            if i is None:
+                last_seen[cell] = len(path)
+                path.append(cell)
+            else:
+                while len(path) > i + 1:
+                    del last_seen[path.pop()]
+        return self._trim_entrances(path)
+
+    def _trim_entrances(self, solution: list):
+        """solution does not include entrances
+
+        Args:
+            solution (list): maze solution from start to end
+        Returns:
+            list: the solution without its start and end cells
+        """
         if len(solution) > 1:
             if solution[0] == self.start:
                 solution = solution[1:]
@@ -0,0 +1,61 @@
+import random
+import typing as tp
+
+from mmaze.solver.base import BaseSolver
+from mmaze.cell import WALL
+
+
+class DepthFirst(BaseSolver):
+    """
+    1. Walk forward from the start, always into the first open neighbor that has not been visited yet.
+    2. Mark every cell entered in a visited bitmap, so no cell is entered twice.
+    3. Back up along the walked path when the current cell has no unvisited open neighbors.
+    4. Stop when the end is reached; the walked path is the solution.
+
+    Terminates after O(cells) steps, and the path it returns never needs pruning.
+    """
+
+    def __init__(self, prune=False, rng: tp.Optional[random.Random] = None):
+        super().__init__(prune=prune, rng=rng)
+
+    def _solve(self):
+        maze_width = self.maze.width
+        maze_height = self.maze.height
+        grid = self.maze.grid
+        start = self.start[0] * maze_width + self.start[1]
+        end = self.end[0] * maze_width + self.end[1]
+        steps = (-maze_width, maze_width, -1, 1)
+
+        visited = bytearray(len(grid))
+        visited[start] = 1
+        # the walked path, and the next direction to try at each of its cells
+        stack = [start]
+        tried = [0]
+        while stack[-1] != end:
+            d = tried[-1]
+            if d == len(steps):
+                stack.pop()
+                tried.pop()
+                if not stack:
+                    # the end is not reachable from the start
+                    return []
+                continue
+            tried[-1] = d + 1
+
+            i = stack[-1]
+            r, c = divmod(i, maze_width)
+            if (d == 0 and r <= 1) or (d == 1 and r >= maze_height - 2) or (d == 2 and c <= 1) or (
+                    d == 3 and c >= maze_width - 2):
+                continue
+            step = steps[d]
+            j = i + 2 * step
+            if not visited[j] and grid[i + step] != WALL and grid[j] != WALL:
+                visited[j] = 1
+                stack.append(j)
+                tried.append(0)
+
+        path = [stack[0]]
+        for i in stack[1:]:
+            path.append((path[-1] + i) // 2)
+            path.append(i)
+        return [self._trim_entrances([divmod(i, maze_width) for i in path])]
@@ -1,7 +1,7 @@
 import os
 import typing as tp
 
-from mmaze.cell import CellType
+from mmaze.cell import ROAD, WALL
 
 if tp.TYPE_CHECKING:
     from mmaze.maze import Maze
@@ -36,12 +36,12 @@ def _plot(
     plt.figure(figsize=((maze.width - 1) / 2, (maze.height - 1) / 2))
 
     img = []
-    for row in maze.data:
+    for r in range(maze.height):
         img_row = []
-        for cell in row:
-            if cell == CellType.ROAD:
+        for cell in maze.get_row(r):
+            if cell == ROAD:
                 v = (1., 1., 1.)
-            elif cell == CellType.WALL:
+            elif cell == WALL:
                 v = (60 / 255, 60 / 255, 60 / 255)
             else:
                 v = (0.6, 0.6, 0.6)
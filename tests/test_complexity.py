@@ -0,0 +1,99 @@
+import gc
+import math
+import time
+import unittest
+
+import mmaze
+
+# maze sides the scaling exponent is fitted over, the number of cells grows 16x overall; smaller mazes are dominated
+# by fixed costs and hide super-linear terms, baseline Prims fits 1.16 over sides 24 to 96 but about 1.35 over these
+SIDES = (64, 128, 256)
+REPEAT = 3
+# highest accepted exponent of linear algorithms
+LINEAR = 1.2
+
+# generator factory and highest accepted exponent of time ~ cells ** exponent, optionally with its own sides
+GENERATOR_CASES = {
+    "backtracking": (mmaze.generator.Backtracking, LINEAR),
+    "binarytree": (mmaze.generator.BinaryTree, LINEAR),
+    "division": (mmaze.generator.Division, LINEAR),
+    "ellers": (mmaze.generator.Ellers, LINEAR),
+    "kruskal": (mmaze.generator.Kruskal, LINEAR),
+    "huntandkill": (mmaze.generator.HuntAndKill, LINEAR),
+    "huntandkill-serpentine": (lambda: mmaze.generator.HuntAndKill(hunt_order="serpentine"), LINEAR),
+    "growingtree": (mmaze.generator.GrowingTree, LINEAR),
+    "growingtree-mixed": (lambda: mmaze.generator.GrowingTree(backtrack_chance=0.5), LINEAR),
+    "growingtree-middle": (lambda: mmaze.generator.GrowingTree(strategy=mmaze.generator.growing_tree.Middle()), LINEAR),
+    "prims": (mmaze.generator.Prims, LINEAR),
+    # loop erased random walks take longer than linear time to hit the tree on a grid
+    "wilsons": (mmaze.generator.Wilsons, 1.35),
+    "wilsons-serpentine": (lambda: mmaze.generator.Wilsons(hunt_order="serpentine"), 1.35),
+}
+
+# highest accepted exponent per solver; the backtracking solver is a random walk without a bound to check
+SOLVER_THRESHOLDS = {
+    "shortestpath": LINEAR,
+    "depthfirst": LINEAR,
+}
+
+
+def _best_time(fn, repeat: int = REPEAT) -> float:
+    best = math.inf
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for seed in range(repeat):
+            t0 = time.perf_counter()
+            fn(seed)
+            best = min(best, time.perf_counter() - t0)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return best
+
+
+def fit_exponent(cells, times) -> float:
+    """least squares slope of log(time) against log(cells)"""
+    xs = [math.log(c) for c in cells]
+    ys = [math.log(t) for t in times]
+    x_mean = sum(xs) / len(xs)
+    y_mean = sum(ys) / len(ys)
+    return sum((x - x_mean) * (y - y_mean) for x, y in zip(xs, ys)) / sum((x - x_mean) ** 2 for x in xs)
+
+
+class ComplexityTest(unittest.TestCase):
+    def assert_scaling(self, name, threshold, fn, sides=SIDES):
+        cells = [s * s for s in sides]
+        times = [_best_time(lambda seed, s=s: fn(s, seed)) for s in sides]
+        exponent = fit_exponent(cells, times)
+        self.assertLessEqual(
+            exponent, threshold,
+            msg=f"{name} scales as cells ** {exponent:.2f}, times {[round(t, 4) for t in times]}")
+
+    def test_generators(self):
+        self.assertLessEqual(set(mmaze._generator_map()), set(GENERATOR_CASES))
+        for name, (factory, threshold, *sides) in GENERATOR_CASES.items():
+            with self.subTest(generator=name):
+                self.assert_scaling(
+                    name, threshold, lambda side, seed, f=factory: f().generate(side, side, seed=seed), *sides)
+
+    def test_solvers(self):
+        mazes = {s: mmaze.generate(s, s, method="kruskal", seed=0) for s in SIDES}
+        for method, threshold in SOLVER_THRESHOLDS.items():
+            with self.subTest(method=method):
+                self.assert_scaling(
+                    method, threshold,
+                    lambda side, seed, m=method: mmaze.solve(mazes[side], (0, 0), (side - 1, side - 1), method=m))
+
+    def test_fit_exponent(self):
+        self.assertAlmostEqual(2.0, fit_exponent([10, 100, 1000], [1, 100, 10000]))
+
+    def test_catches_frontier_rebuild(self):
+        # baseline Prims rebuilt its frontier of about side cells on every one of the side ** 2 steps
+        def rebuild(side, seed):
+            frontier = list(range(side))
+            for i in range(side * side):
+                frontier = list(set(frontier[1:] + [i + side]))
+
+        with self.assertRaises(AssertionError):
+            self.assert_scaling("frontier rebuild", LINEAR, rebuild, sides=(32, 64, 128))
@@ -1,6 +1,10 @@
+import json
 import os
 import random
+import tempfile
+import threading
 import unittest
+from unittest import mock
 
 import matplotlib.pyplot as plt
 
@@ -74,6 +78,220 @@ class MazeToolTest(unittest.TestCase):
         self.m = g.generate(self.w, self.h)
 
 
+class PerfectMazeTest(unittest.TestCase):
+    def assert_perfect(self, m):
+        # a spanning tree over w*h cells opens exactly w*h - 1 walls between them
+        n_road = sum(row.count(0) for row in m.to_number())
+        self.assertEqual(2 * m.base_width * m.base_height - 1, n_road)
+
+    def test_backtracking(self):
+        self.assert_perfect(mmaze.generate(60, 40, method="backtracking"))
+        # cells already open are left alone
+        m = mmaze.Maze(5, 4)
+        m.set_row(1, bytes(m.width - 2), col=1)
+        mmaze.generator.base.CarvingKernel(m).backtrack(3 * m.width + 3, random.Random(0))
+        # so the first row stays a corridor of 9 positions, and a tree spans the 15 other cells
+        self.assertEqual(9 + 2 * 15 - 1, sum(row.count(0) for row in m.to_number()))
+        self.assertEqual(bytes([1]) + bytes(9) + bytes([1]), m.get_row(1))
+
+    def test_carving_kernel(self):
+        m = mmaze.Maze(3, 2)
+        m.set_value(1, 1, mmaze.cell.ROAD)
+        kernel = mmaze.generator.base.CarvingKernel(m)
+        top_left = 1 * m.width + 1
+        # neighbors out of the maze count as visited
+        self.assertEqual([3 * m.width + 1, 1 * m.width + 3], kernel.unvisited(top_left))
+        kernel.carve(top_left, 1 * m.width + 3)
+        self.assertEqual([3 * m.width + 1], kernel.unvisited(top_left))
+        self.assertEqual([0, 0, 0], list(m.get_row(1)[1:4]))
+        self.assertEqual([3 * m.width + 3, 1 * m.width + 5], kernel.unvisited(1 * m.width + 3))
+
+    def test_kruskal(self):
+        self.assert_perfect(mmaze.generate(60, 40, method="kruskal"))
+
+    def test_wilsons(self):
+        for hunt_order in ["random", "serpentine"]:
+            self.assert_perfect(mmaze.generator.Wilsons(hunt_order=hunt_order).generate(40, 30))
+
+    def test_wilsons_uniform(self):
+        # a 2x2 grid has 4 spanning trees, Wilson's algorithm samples them uniformly
+        g = mmaze.generator.Wilsons(rng=random.Random(0))
+        counts = {}
+        for _ in range(4000):
+            key = g.generate(2, 2).tobytes()
+            counts[key] = counts.get(key, 0) + 1
+        self.assertEqual(4, len(counts))
+        for c in counts.values():
+            self.assertLess(abs(c - 1000), 150)
+
+    def test_hunt_and_kill(self):
+        for hunt_order in ["random", "serpentine"]:
+            for seed in range(5):
+                self.assert_perfect(mmaze.generator.HuntAndKill(hunt_order=hunt_order).generate(25, 17, seed=seed))
+
+    def test_growing_tree(self):
+        gt = mmaze.generator.growing_tree
+        strategies = [
+            gt.Newest(), gt.RandomCell(), gt.Oldest(), gt.Middle(), gt.Mix([(gt.Newest(), 3), (gt.Oldest(), 1)])]
+        for strategy in strategies:
+            self.assert_perfect(mmaze.generator.GrowingTree(strategy=strategy).generate(30, 20, seed=1))
+        for backtrack_chance in [0.0, 0.5, 1.0]:
+            self.assert_perfect(mmaze.generator.GrowingTree(backtrack_chance=backtrack_chance).generate(30, 20))
+
+    def test_prims(self):
+        self.assert_perfect(mmaze.generate(60, 40, method="prims"))
+
+    def test_binary_tree(self):
+        bt = mmaze.generator.binary_tree
+        for skew in bt.SKEWES:
+            for w, h in [(1, 1), (1, 6), (6, 1), (17, 11)]:
+                m = mmaze.generator.BinaryTree(skew=skew).generate(w, h, seed=w * h)
+                self.assert_perfect(m)
+                # the row by row engine, used without numpy, makes the same maze
+                rows = mmaze.Maze(w, h)
+                bt.BinaryTree._carve_rows(rows, bt.SKEWES[skew], random.Random(w * h))
+                self.assertEqual(m.tobytes(), rows.tobytes())
+
+    def test_division(self):
+        self.assert_perfect(mmaze.generate(60, 40, method="division"))
+        # small regions are divided from their own seeds, in this process or in workers alike
+        m = mmaze.generator.Division(workers=1, task_cells=64, parallel_cells=0).generate(40, 30, seed=5)
+        self.assert_perfect(m)
+        parallel = mmaze.generator.Division(workers=2, task_cells=64, parallel_cells=0).generate(40, 30, seed=5)
+        self.assertEqual(m.tobytes(), parallel.tobytes())
+
+        # parallelism is opt-in, the default divides in this process whatever the maze size
+        with mock.patch("mmaze.generator.division.ProcessPoolExecutor", side_effect=AssertionError("pool started")):
+            default = mmaze.generator.Division(task_cells=64, parallel_cells=0).generate(40, 30, seed=5)
+        self.assertEqual(m.tobytes(), default.tobytes())
+        # without shared memory, before python 3.8, workers divide in this process too
+        with mock.patch("mmaze.generator.division._shared_memory", return_value=None), \
+                mock.patch("mmaze.generator.division.ProcessPoolExecutor", side_effect=AssertionError("pool started")):
+            serial = mmaze.generator.Division(workers=2, task_cells=64, parallel_cells=0).generate(40, 30, seed=5)
+        self.assertEqual(m.tobytes(), serial.tobytes())
+
+    def test_ellers(self):
+        for xskew in [0.0, 0.5, 1.0]:
+            self.assert_perfect(mmaze.generator.Ellers(xskew=xskew).generate(30, 200))
+
+
+class BatchTest(unittest.TestCase):
+    def test_generate_many(self):
+        mazes = mmaze.generate_many(6, 8, 5, method="kruskal", seeds=range(6), workers=2, solve=((0, 0), (4, 7)))
+        self.assertEqual(6, len(mazes))
+        for seed, m in enumerate(mazes):
+            self.assertEqual(mmaze.generate(8, 5, method="kruskal", seed=seed).to_number(), m.to_number())
+            self.assertGreater(len(m.solutions[0]), 0)
+
+        data = mmaze.generate_many(
+            [{"method": "prims"}, {"width": 3}], width=4, height=4, seeds=[1, 2],
+            serializer=mmaze.Maze.tobytes, workers=2, ordered=False)
+        sizes = sorted(mmaze.Maze.frombytes(d).base_width for d in data)
+        self.assertEqual([3, 4], sizes)
+
+        with self.assertRaises(ValueError):
+            mmaze.generate_many(2, 4, 4, seeds=[1])
+        with self.assertRaises(ValueError):
+            mmaze.generate_many(2, 4, 4, chunksize=0)
+
+    def test_close_unordered(self):
+        data = mmaze.generate_many(4, 4, 4, seeds=range(4), workers=2, chunksize=1, ordered=False)
+        self.assertEqual(4, next(data).base_width)
+        data.close()
+        self.assertEqual([], list(data))
+
+
+class BenchTest(unittest.TestCase):
+    def test_run(self):
+        from mmaze import bench
+        result = bench.run(sizes=[16, 36], generators=["prims", "ellers"], solvers=["depthfirst"], repeat=2)
+        self.assertEqual(6, len(result["results"]))
+        for r in result["results"]:
+            self.assertIsNone(r["error"])
+            self.assertLessEqual(r["median_s"], r["p95_s"])
+            self.assertGreater(r["peak_bytes"], 0)
+
+    def test_main(self):
+        from mmaze import bench
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "bench.json")
+            bench.main(["--sizes", "9", "--repeat", "1", "--generators", "kruskal", "--solvers", "", "-o", path])
+            with open(path, encoding="utf-8") as f:
+                result = json.load(f)
+        self.assertEqual(["kruskal"], [r["method"] for r in result["results"]])
+
+    def test_solver_seed(self):
+        from mmaze import bench
+        maze = mmaze.generate(6, 6, method="kruskal", seed=0)
+        seen = []
+        solve = mmaze.solver.Backtracking.solve
+
+        def seeded_solve(s, *args, **kwargs):
+            seen.append(s.rng.random())
+            return solve(s, *args, **kwargs)
+
+        with mock.patch.object(mmaze.solver.Backtracking, "solve", seeded_solve):
+            self.assertIsNone(bench.bench_solver("backtracking", maze, repeat=2)["error"])
+        self.assertEqual([random.Random(seed).random() for seed in [0, 1, 0]], seen)
+
+        # no solver maze is generated when no solver is benchmarked
+        with mock.patch("mmaze.generate", wraps=mmaze.generate) as generate:
+            bench.run(sizes=[9], generators=["kruskal"], solvers=[], repeat=1)
+        self.assertEqual(2, generate.call_count)
+
+
+class EllersStreamTest(unittest.TestCase):
+    def test_iter_rows(self):
+        g = mmaze.generator.Ellers()
+        rows = list(g.iter_rows(8, 6, seed=3))
+        m = g.generate(8, 6, seed=3)
+        self.assertEqual(m.to_number(), [list(row) for row in rows])
+
+    def test_empty(self):
+        m = mmaze.generate(3, 0, method="ellers")
+        self.assertEqual([[1] * 7], m.to_number())
+        self.assertEqual([bytes([1]) * 7], list(mmaze.generator.Ellers().iter_rows(3, 0)))
+        self.assertEqual([[1]] * 7, mmaze.generate(0, 3, method="ellers").to_number())
+
+    def test_endless(self):
+        rows = mmaze.generator.Ellers().iter_rows(5)
+        for _, row in zip(range(1000), rows):
+            self.assertEqual(11, len(row))
+
+
+class ChunkedMazeTest(unittest.TestCase):
+    def test_perfect(self):
+        for method in ["backtracking", "kruskal", "binarytree"]:
+            world = mmaze.ChunkedMaze(7, chunk_width=5, chunk_height=4, method=method, cache_size=4)
+            # any block of chunks around the origin chunk is a perfect maze, leaving out doors to the outside
+            rows = world.window(-8 + 1, -10 + 1, 24 - 1, 30 - 1)
+            n_road = sum(r.count(0) for r in rows)
+            self.assertEqual(2 * 15 * 12 - 1, n_road, msg=method)
+
+    def test_cache(self):
+        world = mmaze.ChunkedMaze(7, chunk_width=5, chunk_height=4, cache_size=4)
+        first = world.chunk(0, 0)
+        for cx in range(1, 4):
+            world.chunk(cx, 0)
+        # the four most recently used chunks are kept
+        self.assertIs(first, world.chunk(0, 0))
+        for cx in range(4, 8):
+            world.chunk(cx, 0)
+        # older ones are dropped, and generated again the same
+        again = world.chunk(0, 0)
+        self.assertIsNot(first, again)
+        self.assertEqual(first.to_number(), again.to_number())
+
+    def test_deterministic(self):
+        world = mmaze.ChunkedMaze(3, chunk_width=6, chunk_height=6, cache_size=2)
+        window = world.window(-30, 50, 40, 70)
+        self.assertEqual(window, mmaze.ChunkedMaze(3, chunk_width=6, chunk_height=6).window(-30, 50, 40, 70))
+        self.assertEqual(70, len(window[0]))
+        self.assertEqual(window[5][7], world.get_value(-25, 57))
+        self.assertEqual(mmaze.CellType.ROAD, world.get(2 * 100 + 1, -2 * 100 + 1))
+        self.assertNotEqual(window, mmaze.ChunkedMaze(4, chunk_width=6, chunk_height=6).window(-30, 50, 40, 70))
+
+
 class RandomTest(unittest.TestCase):
     def test_seed(self):
         seed = 4
@@ -81,6 +299,35 @@ class RandomTest(unittest.TestCase):
         g2 = mmaze.generate(15, 15, seed=seed, method="prims")
         self.assertEqual(g1.to_number(), g2.to_number())
 
+        g1 = mmaze.generate(15, 15, seed=seed, method="binarytree")
+        g2 = mmaze.generate(15, 15, seed=seed, method="binarytree")
+        self.assertEqual(g1.to_number(), g2.to_number())
+
+    def test_concurrent_seed(self):
+        methods = ["backtracking", "prims", "wilsons", "ellers", "growingtree", "huntandkill"]
+        expected = {m: mmaze.generate(12, 12, seed=7, method=m).to_number() for m in methods}
+        results = {}
+
+        def run(method):
+            for _ in range(5):
+                results.setdefault(method, []).append(mmaze.generate(12, 12, seed=7, method=method).to_number())
+
+        threads = [threading.Thread(target=run, args=(m,)) for m in methods]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        for m in methods:
+            self.assertEqual([expected[m]] * 5, results[m])
+
+    def test_rng(self):
+        m1 = mmaze.generator.Prims(rng=random.Random(3)).generate(10, 10)
+        m2 = mmaze.generator.Prims(rng=random.Random(3)).generate(10, 10)
+        self.assertEqual(m1.to_number(), m2.to_number())
+        s1 = mmaze.solver.Backtracking(rng=random.Random(1)).solve(m1, (0, 0), (9, 9))
+        s2 = mmaze.solver.Backtracking(rng=random.Random(1)).solve(m1, (0, 0), (9, 9))
+        self.assertEqual(s1, s2)
+
 
 class SolverTest(unittest.TestCase):
     def test_backtracking_solver(self):
@@ -94,6 +341,118 @@ class SolverTest(unittest.TestCase):
         self.assertGreater(len(solutions), 0)
         self.assertGreater(len(solutions[0]), 0)
 
+    def test_shortest_path_solver(self):
+        m = mmaze.generate(15, 12, method="kruskal", seed=1)
+        solutions = mmaze.solver.ShortestPath().solve(m, (0, 0), (11, 14))
+        self.assertEqual(1, len(solutions))
+        # a perfect maze has a single path, which the random walk finds as well
+        self.assertEqual(mmaze.solver.Backtracking().solve(m, (0, 0), (11, 14)), solutions)
+
+        m = mmaze.generate(21, 21, symmetry="b", method="prims", seed=1)
+        shortest = mmaze.solve(m, (0, 0), (20, 20), method="shortestpath")[0]
+        for _ in range(5):
+            self.assertLessEqual(len(shortest), len(mmaze.solve(m, (0, 0), (20, 20))[0]))
+
+    def test_depth_first_solver(self):
+        m = mmaze.generate(40, 30, method="kruskal", seed=2)
+        solutions = mmaze.solve(m, (0, 0), (29, 39), method="depthfirst")
+        self.assertEqual(mmaze.solve(m, (0, 0), (29, 39), method="shortestpath"), solutions)
+        self.assertEqual(len(solutions[0]), len(set(solutions[0])))
+
+        m = mmaze.generate(21, 21, symmetry="b", method="backtracking", seed=2)
+        solution = mmaze.solver.DepthFirst().solve(m, (0, 0), (20, 20))[0]
+        self.assertEqual(len(solution), len(set(solution)))
+
+    def test_distance_field(self):
+        m = mmaze.generate(30, 20, method="kruskal", seed=3)
+        field = m.distance_field((19, 29))
+        self.assertIs(field, m.distance_field((19, 29)))
+        self.assertEqual(0, field.get_distance((19, 29)))
+        for start in [(0, 0), (10, 3), (19, 28)]:
+            expected = mmaze.solve(m, start, (19, 29), method="shortestpath")
+            self.assertEqual(expected, m.solve(start, (19, 29), method="shortestpath"))
+            self.assertEqual(expected, field.solutions(start))
+            self.assertEqual(
+                mmaze.solve(m, (19, 29), start, method="shortestpath"), m.solve((19, 29), start, "shortestpath"))
+            self.assertEqual((len(expected[0]) + 1) // 2, field.get_distance(start))
+        self.assertEqual(
+            mmaze.solve(m, (19, 29), (19, 29), method="shortestpath"), m.solve((19, 29), (19, 29), "shortestpath"))
+        # other solvers do not read the field
+        with mock.patch.object(field, "solutions", side_effect=AssertionError):
+            self.assertEqual(mmaze.solve(m, (0, 0), (19, 29), "depthfirst"), m.solve((0, 0), (19, 29), "depthfirst"))
+
+        # writing the grid drops the field, walling off the target makes it unreachable
+        m.set_row(38, bytes([1]), col=59)
+        m.set_col(58, bytes([1]), row=39)
+        self.assertIsNot(field, m.distance_field((19, 29)))
+        self.assertEqual([], m.solve((0, 0), (19, 29), method="shortestpath"))
+        self.assertEqual(-1, m.distance_field((19, 29)).get_distance((0, 0)))
+
+    def test_tree_index(self):
+        m = mmaze.generate(40, 30, method="wilsons", seed=4)
+        index = m.tree_index()
+        self.assertIs(index, m.tree_index())
+        rng = random.Random(0)
+        for _ in range(200):
+            a = (rng.randrange(30), rng.randrange(40))
+            b = (rng.randrange(30), rng.randrange(40))
+            self.assertEqual(mmaze.solve(m, a, b, method="shortestpath"), index.solutions(a, b))
+            self.assertEqual(m.distance_field(b).get_distance(a), index.distance(a, b))
+        self.assertEqual(0, index.distance((3, 3), (3, 3)))
+
+        # opening a wall makes a loop
+        m.set_row(1, bytes(m.width - 2), col=1)
+        with self.assertRaises(ValueError):
+            m.tree_index()
+
+    def test_solve_many(self):
+        rng = random.Random(1)
+        cells = [(rng.randrange(20), rng.randrange(25)) for _ in range(12)]
+        pairs = [(a, b) for a in cells for b in cells[:3]] + [((0, 0), b) for b in cells] + [((4, 4), (4, 4))]
+        for method, symmetry in [("kruskal", "none"), ("prims", "both")]:
+            m = mmaze.generate(25, 20, method=method, symmetry=symmetry, seed=6)
+            expected = [mmaze.solve(m, a, b, method="shortestpath") for a, b in pairs]
+            for solve_method in ["auto", "shortestpath"]:
+                solutions = mmaze.solve_many(m, pairs, method=solve_method)
+                if method == "kruskal":
+                    self.assertEqual(expected, solutions)
+                else:
+                    # shortest paths of a maze with loops may differ, not their lengths
+                    self.assertEqual([len(s[0]) for s in expected], [len(s[0]) for s in solutions])
+            lengths = mmaze.solve_many(m, pairs, lengths=True)
+            self.assertEqual([m.distance_field(b).get_distance(a) for a, b in pairs], lengths)
+
+        # the fields of a batch are not cached on the maze
+        with mock.patch.object(mmaze.Maze, "distance_field", side_effect=AssertionError("cached field")):
+            self.assertEqual(lengths, mmaze.solve_many(m, pairs, method="shortestpath", lengths=True))
+
+        # a maze with loops is found not perfect once, not on every call
+        m = mmaze.generate(25, 20, method="prims", symmetry="both", seed=6)
+        with mock.patch("mmaze.maze.TreePathIndex", wraps=mmaze.distance.TreePathIndex) as index:
+            for _ in range(3):
+                mmaze.solve_many(m, pairs[:4])
+            self.assertEqual(1, index.call_count)
+
+        m = mmaze.generate(25, 20, method="kruskal", seed=6)
+        expected = [mmaze.solve(m, a, b, method="depthfirst") for a, b in pairs[:5]]
+        self.assertEqual(expected, mmaze.solve_many(m, pairs[:5], method="depthfirst"))
+        # wall off the bottom right cell
+        m.set_row(m.height - 3, bytes([1]), col=m.width - 2)
+        m.set_col(m.width - 3, bytes([1]), row=m.height - 2)
+        walled = [((0, 0), (0, 0)), ((0, 0), (19, 24)), ((1, 1), (19, 24))]
+        self.assertEqual([0, -1, -1], mmaze.solve_many(m, walled, lengths=True))
+        self.assertEqual([], mmaze.solve_many(m, [((0, 0), (19, 24))])[0])
+
+    def test_prune_solution(self):
+        s = mmaze.solver.Backtracking()
+        s.start, s.end = (1, 1), (1, 5)
+        walk = [(1, 1), (1, 2), (1, 3), (2, 3), (3, 3), (2, 3), (1, 3), (1, 2), (1, 1),
+                (1, 2), (1, 3), (1, 4), (1, 5)]
+        self.assertEqual([(1, 2), (1, 3), (1, 4)], s.prune_solutions([walk])[0])
+
+        walk = [(1, 1)] + [(1, 2), (1, 3), (1, 2), (1, 1)] * 100000 + [(1, 2), (1, 3), (1, 4), (1, 5)]
+        self.assertEqual([(1, 2), (1, 3), (1, 4)], s.prune_solutions([walk])[0])
+
     def test_solve_from_maze(self):
         g = mmaze.generator.Prims()
         m = g.generate(10, 10)
@@ -155,7 +514,67 @@ class SymmetryTest(unittest.TestCase):
             with self.assertRaises(ValueError):
                 mmaze.generate(width=h, height=h, symmetry="v", method=method)
 
+    def test_symmetry_mirrored(self):
+        for method in ["backtracking", "growingtree", "huntandkill", "prims"]:
+            for w, h in [(8, 6), (9, 7), (8, 7), (1, 4)]:
+                for s in ["v", "h", "b"]:
+                    m = mmaze.generate(width=w, height=h, symmetry=s, method=method, seed=w * h)
+                    rows = [m.get_row(r) for r in range(m.height)]
+                    if s in ("v", "b"):
+                        self.assertEqual(rows, rows[::-1])
+                    if s in ("h", "b"):
+                        self.assertEqual(rows, [r[::-1] for r in rows])
+                    # even sizes get a door between the mirrored halves
+                    for end in [(h - 1, w - 1), (h - 1, 0), (0, w - 1)]:
+                        solutions = mmaze.solve(m, (0, 0), end, method="shortestpath")
+                        self.assertGreater(len(solutions), 0, msg=f"method={method}, s={s}, size={w}x{h}")
+
     def test_symmetry_horizontal(self):
         w = 7
         m = mmaze.generate(width=w, height=w, symmetry="h", method="backtracking")
         self.assertEqual(w * 2 + 1, len(m.data[0]))
+
+
+class StorageTest(unittest.TestCase):
+    def test_compact_grid(self):
+        m = mmaze.Maze(4, 3)
+        self.assertEqual(m.width * m.height, len(m.grid))
+        self.assertEqual(mmaze.CellType.WALL, m.get(1, 1))
+        m.set(1, 1, mmaze.CellType.ROAD)
+        self.assertEqual(mmaze.CellType.ROAD, m.data[1][1])
+        self.assertEqual(mmaze.CellType.ROAD, m.get(-m.height + 1, -m.width + 1))
+        m.data[0] = [mmaze.CellType.ROAD] * m.width
+        self.assertEqual([0] * m.width, m.to_number()[0])
+
+    def test_numpy_storage(self):
+        try:
+            import numpy  # pylint: disable=unused-import
+        except ModuleNotFoundError:
+            self.skipTest("numpy is not installed")
+        m = mmaze.Maze(5, 5, storage="numpy")
+        m.set_row(1, bytes([0]) * 3, col=1, step=2)
+        self.assertEqual([1, 0, 1, 0, 1, 0, 1], m.to_number()[1][:7])
+        self.assertEqual(mmaze.CellType.ROAD, m.get(1, 3))
+
+        with self.assertRaises(ValueError):
+            mmaze.Maze(5, 5, storage="sss")
+
+    def test_mmap_storage(self):
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "maze.bin")
+            for method in ["backtracking", "kruskal", "ellers", "division", "binarytree"]:
+                with mmaze.generate(12, 9, method=method, seed=2, storage="mmap", path=path) as m:
+                    expected = mmaze.generate(12, 9, method=method, seed=2).to_number()
+                    self.assertEqual(expected, m.to_number())
+                with mmaze.Maze.open(path) as m:
+                    self.assertEqual(expected, m.to_number())
+                    self.assertEqual((12, 9), (m.base_width, m.base_height))
+                    with self.assertRaises(TypeError):
+                        m.set(1, 1, mmaze.CellType.WALL)
+
+            # a file backed binary tree maze is written row by row, without building the whole grid
+            with mock.patch.object(mmaze.generator.BinaryTree, "_carve_grid", side_effect=AssertionError):
+                mmaze.generate(12, 9, method="binarytree", seed=2, storage="mmap", path=path).close()
+
+        with self.assertRaises(ValueError):
+            mmaze.Maze(5, 5, storage="mmap")